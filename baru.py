@@ -1,11 +1,36 @@
-import pygame  # Mengimpor modul pygame untuk membuat game
+import atexit  # Mengimpor atexit untuk menutup penulis telemetri saat keluar
+import gc  # Mengimpor gc untuk statistik objek pada mode pelacakan memori
+import importlib  # Mengimpor importlib untuk memuat pygame saat pertama kali dipakai
+import math  # Mengimpor math untuk gerakan sub-piksel
+import os  # Mengimpor modul os untuk path file dan variabel lingkungan
+import random  # Mengimpor random untuk RNG permainan yang bisa di-seed
+import struct  # Mengimpor struct untuk format biner paket sprite
 import sys  # Mengimpor modul sys untuk interaksi dengan sistem
 import time  # Mengimpor modul time untuk mengatur waktu
-from collections import deque  # Mengimpor deque untuk implementasi antrian
+import zlib  # Mengimpor zlib untuk kompresi paket sprite
+from array import array  # Mengimpor array untuk histogram waktu frame berukuran tetap
+from collections import Counter, deque  # Mengimpor Counter untuk jumlah objek dan deque untuk implementasi antrian
+from itertools import islice  # Mengimpor islice untuk menyalin jalur tanpa slice sementara
 from abc import ABC, abstractmethod  # Mengimpor ABC dan abstractmethod untuk membuat kelas abstrak
-
-# Inisialisasi pygame
-pygame.init()
+from pathfinding import NextHopPathfinder, PathRequestQueue, choose_pathfinder  # Mengimpor pencari jalur dan antriannya untuk penjaga
+
+# Modul yang baru diimpor saat atributnya pertama kali diakses
+class LazyModule:
+    def __init__(self, name, namespace):
+        self._name = name  # Nama modul yang ditunda
+        self._namespace = namespace  # Namespace yang menyimpan proxy ini
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)  # Mengimpor modul asli
+        self._namespace[self._name] = module  # Mengganti proxy agar akses berikutnya langsung
+        return getattr(module, attr)
+
+# pygame diimpor saat pertama kali dipakai agar "import baru" tetap ringan
+pygame = LazyModule('pygame', globals())
+tracemalloc = LazyModule('tracemalloc', globals())  # Hanya dipakai pada mode pelacakan memori
+json = LazyModule('json', globals())  # Hanya dipakai jika telemetri aktif
+queue = LazyModule('queue', globals())
+threading = LazyModule('threading', globals())
 
 # Konstanta untuk ukuran layar dan warna
 WIDTH, HEIGHT = 800, 600
@@ -18,14 +43,486 @@ GREEN = (0, 255, 0)
 BUTTON_COLOR = (200, 200, 200)
 BUTTON_TEXT_COLOR = BLACK
 
-# Membuat layar game
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Maze Runner Arcade")  # Judul jendela
-clock = pygame.time.Clock()  # Mengatur kecepatan frame
+# Posisi awal (dalam tile) dan kecepatan karakter
+PLAYER_START = (0, 7)  # Posisi awal pemain
+PLAYER_SPEED = 5  # Kecepatan pemain (piksel per tick)
+GUARD_SPEED = 2  # Kecepatan penjaga (piksel per tick)
+GUARD_SETUPS = {  # Posisi awal penjaga untuk setiap tingkat kesulitan
+    'easy': [(1, 1)],  # Satu penjaga untuk kesulitan mudah
+    'medium': [(1, 1), (18, 1)],  # Dua penjaga untuk kesulitan sedang
+    'hard': [(1, 1), (18, 1), (1, 13)],  # Tiga penjaga untuk kesulitan sulit
+}
+AI_TIERS = ((8, 1), (16, 2), (None, 4))  # (jarak maksimum ke pemain dalam tile, interval update dalam tick)
+PATROL_REACH = 6  # Jarak (langkah tile) titik balik rute patroli dari tile awal penjaga
+GUARD_VIEW_RANGE = 8  # Jarak pandang penjaga (tile, per sumbu)
+GUARD_PATROL, GUARD_CHASE, GUARD_SEARCH = 0, 1, 2  # Status penjaga: patroli, mengejar, mencari di tempat terakhir terlihat
+
+TITLE_FONT_SIZE = 74  # Ukuran font judul
+BUTTON_FONT_SIZE = 50  # Ukuran font tombol
+HUD_FONT_SIZE = 24  # Ukuran font tampilan di atas permainan
+
+HUD_GLYPHS = "0123456789:./ TIMESTARFP"  # Karakter di atlas glyph HUD
+HUD_MARGIN = 8  # Jarak HUD dari tepi layar (piksel)
+
+TICKS_PER_SECOND = 60  # Tick logika per detik pada kecepatan normal
+TURBO_LEVELS = (1, 4, 16, 64, None)  # Tick logika per frame yang digambar; None = tanpa batas (tombol F mengganti)
+TURBO_SLICE = 1 / 30  # Mode tanpa batas: lama tick dijalankan sebelum event diproses dan layar diperbarui (detik)
+
+# Skala tampilan: game selalu menggambar di permukaan logis WIDTH x HEIGHT
+# '1' = jendela biasa, 'auto' = pygame.SCALED (skala bulat dipilih SDL, di GPU jika ada),
+# 'fullscreen' = SCALED layar penuh, angka lain (mis. 2 atau 2.7) = satu transform.scale per frame ke jendela
+DISPLAY_SCALE = os.environ.get('MAZE_DISPLAY_SCALE', '1')
+
+# Layar dan clock game, dibuat oleh init()
+screen = None  # Permukaan logis tempat semua gambar dibuat
+window = None  # Permukaan jendela; sama dengan screen kecuali pada skala perangkat lunak
+clock = None
+
+def init():
+    # Membuka layar game; aman dipanggil berkali-kali
+    global screen, window, clock
+    if screen is None:
+        pygame.display.init()  # Hanya subsistem display, bukan semua subsistem pygame
+        if DISPLAY_SCALE in ('auto', 'fullscreen'):
+            flags = pygame.SCALED | (pygame.FULLSCREEN if DISPLAY_SCALE == 'fullscreen' else 0)
+            screen = window = pygame.display.set_mode((WIDTH, HEIGHT), flags)  # SDL menskalakan saat flip
+        elif float(DISPLAY_SCALE) == 1:
+            screen = window = pygame.display.set_mode((WIDTH, HEIGHT))
+        else:
+            scale = float(DISPLAY_SCALE)
+            window = pygame.display.set_mode((round(WIDTH * scale), round(HEIGHT * scale)))
+            screen = pygame.Surface((WIDTH, HEIGHT)).convert()  # Format sama dengan jendela agar skala tanpa konversi
+        pygame.display.set_caption("Maze Runner Arcade")  # Judul jendela
+        clock = pygame.time.Clock()  # Mengatur kecepatan frame
+    return screen
+
+def present():
+    # Menampilkan frame: pada skala perangkat lunak permukaan logis diskalakan langsung ke jendela (tanpa surface baru)
+    if window is not screen:
+        pygame.transform.scale(screen, window.get_size(), window)  # Nearest-neighbour, juga untuk skala pecahan
+    pygame.display.flip()
+
+def logical_event(event):
+    # Posisi mouse jendela -> koordinat logis (hanya perlu pada skala perangkat lunak)
+    if window is screen or not hasattr(event, 'pos'):
+        return event
+    window_width, window_height = window.get_size()
+    pos = (event.pos[0] * WIDTH // window_width, event.pos[1] * HEIGHT // window_height)
+    return pygame.event.Event(event.type, event.dict, pos=pos)
+
+_fonts = {}  # Font yang sudah dimuat per ukuran
+
+def get_font(size):
+    # Memuat font saat pertama kali dibutuhkan
+    font = _fonts.get(size)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
+# Kelas untuk cache teks yang sudah dirender
+class TextCache:
+    def __init__(self):
+        self._surfaces = {}  # Menyimpan surface berdasarkan (font, teks, warna, antialias)
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)  # Kunci cache
+        surface = self._surfaces.get(key)
+        if surface is None:  # Render hanya jika belum ada di cache
+            surface = font.render(text, antialias, color)
+            self._surfaces[key] = surface
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()  # Mengosongkan cache
+
+text_cache = TextCache()  # Cache teks global untuk tombol dan judul menu
+
+MENU_IDLE_TIMEOUT = 500  # Batas waktu tunggu event di menu (milidetik)
+
+def wait_menu_events(timeout=MENU_IDLE_TIMEOUT):
+    # Memblokir sampai ada event atau timeout, lalu mengambil semua event yang tertunda
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []  # Tidak ada input, menu tidak perlu digambar ulang
+    return [logical_event(event) for event in [event] + pygame.event.get()]
+
+# Paket sprite yang sudah diskalakan (dibuat oleh build_assets.py)
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))  # Folder aset game
+SPRITE_PACK_PATH = os.path.join(ASSET_DIR, 'sprites.pack')  # Lokasi paket sprite
+SPRITE_PACK_MAGIC = b'MZPK'  # Penanda format paket sprite
+SPRITE_PACK_VERSION = 2  # Versi format paket sprite (2: sidik gambar sumber di header)
+SPRITE_SOURCE_RECORD = struct.Struct('<II')  # Ukuran file dan CRC32 setiap gambar sumber
+SPRITE_TILE_SIZES = (20, 40, 80)  # Ukuran tile yang didukung oleh paket
+ANIMATION_FRAMES = 4  # Jumlah frame animasi pemain dan penjaga (player1..4, guard1..4)
+SPRITE_SOURCES = {  # Gambar sumber untuk setiap sprite
+    'star': 'star.png',
+    'wall': 'wall.jpg',
+    'player1': 'imgp/1.png',
+    'player2': 'imgp/2.png',
+    'player3': 'imgp/3.png',
+    'player4': 'imgp/4.png',
+    'guard1': 'imgg/1.png',
+    'guard2': 'imgg/2.png',
+    'guard3': 'imgg/3.png',
+    'guard4': 'imgg/4.png',
+}
+STARTUP_PROBE = os.environ.get('MAZE_STARTUP_PROBE') == '1'  # Keluar setelah frame interaktif pertama
+MEMORY_TRACE = os.environ.get('MAZE_MEMORY_TRACE') == '1'  # Laporan memori di setiap pergantian layar
+TELEMETRY_PATH = os.environ.get('MAZE_TELEMETRY')  # File JSONL telemetri per ronde; tidak diatur = mati
+TELEMETRY_QUEUE_SIZE = 1024  # Event yang boleh menunggu penulis; jika penuh event baru dibuang
+TELEMETRY_BATCH = 64  # Event maksimum per penulisan file
+FRAME_HISTOGRAM_STEP_MS = 0.1  # Lebar satu bucket histogram waktu frame (milidetik)
+FRAME_HISTOGRAM_BUCKETS = 1000  # Bucket sampai 100 ms; frame yang lebih lama masuk bucket terakhir
+
+def source_fingerprint(source):
+    # (ukuran file, CRC32) gambar sumber, disimpan di paket untuk mendeteksi paket yang usang
+    with open(os.path.join(ASSET_DIR, source), 'rb') as source_file:
+        data = source_file.read()
+    return len(data), zlib.crc32(data)
+
+def stale_sprite_sources(fingerprints, check_contents=False):
+    # Nama sprite yang gambar sumbernya berbeda dari saat paket dibuat.
+    # Tanpa check_contents hanya ukuran file yang dibandingkan (cukup stat, murah saat startup).
+    stale = []
+    for name, source in SPRITE_SOURCES.items():
+        path = os.path.join(ASSET_DIR, source)
+        if name not in fingerprints:
+            stale.append(name)
+        elif not os.path.exists(path):
+            continue  # Sumber tidak ikut dikirim: paket menjadi satu-satunya aset
+        elif os.path.getsize(path) != fingerprints[name][0] or \
+                (check_contents and source_fingerprint(source) != fingerprints[name]):
+            stale.append(name)
+    return stale
+
+def write_sprite_pack(path, sprites, fingerprints):
+    # Menulis sprite {(ukuran_tile, nama): surface} dan sidik sumber {nama: (ukuran, crc)} ke satu file paket
+    header = struct.pack('<H', len(fingerprints))
+    for name, fingerprint in sorted(fingerprints.items()):
+        encoded_name = name.encode('ascii')
+        header += struct.pack('<B', len(encoded_name)) + encoded_name + SPRITE_SOURCE_RECORD.pack(*fingerprint)
+    payload = bytearray()
+    for (tile_size, name), surface in sorted(sprites.items()):
+        encoded_name = name.encode('ascii')
+        payload += struct.pack('<HB', tile_size, len(encoded_name)) + encoded_name
+        payload += pygame.image.tobytes(surface, 'RGBA')  # Piksel mentah, sprite selalu persegi
+    with open(path, 'wb') as pack_file:
+        pack_file.write(struct.pack('<4sHH', SPRITE_PACK_MAGIC, SPRITE_PACK_VERSION, len(sprites)))
+        pack_file.write(header)
+        pack_file.write(zlib.compress(bytes(payload), 9))
+
+def read_sprite_pack_header(pack_file):
+    # Membaca header paket; mengembalikan (jumlah sprite, sidik sumber) dan berhenti di awal data sprite
+    magic, version, count = struct.unpack('<4sHH', pack_file.read(8))
+    if magic != SPRITE_PACK_MAGIC or version != SPRITE_PACK_VERSION:
+        raise ValueError(f"Unsupported sprite pack: {pack_file.name}")
+    fingerprints = {}
+    source_count, = struct.unpack('<H', pack_file.read(2))
+    for _ in range(source_count):
+        name_length, = struct.unpack('<B', pack_file.read(1))
+        name = pack_file.read(name_length).decode('ascii')
+        fingerprints[name] = SPRITE_SOURCE_RECORD.unpack(pack_file.read(SPRITE_SOURCE_RECORD.size))
+    return count, fingerprints
+
+def read_sprite_pack(path, tile_size):
+    # Membaca sprite untuk satu ukuran tile dari file paket; ValueError jika paket tidak cocok dengan sumbernya
+    with open(path, 'rb') as pack_file:
+        count, fingerprints = read_sprite_pack_header(pack_file)
+        stale = stale_sprite_sources(fingerprints)
+        if stale:
+            raise ValueError(f"Sprite pack is out of date for {', '.join(stale)}; run build_assets.py")
+        payload = zlib.decompress(pack_file.read())
+
+    sprites = {}
+    offset = 0
+    for _ in range(count):
+        size, name_length = struct.unpack_from('<HB', payload, offset)
+        offset += 3
+        name = payload[offset:offset + name_length].decode('ascii')
+        offset += name_length
+        byte_count = size * size * 4
+        if size == tile_size:  # Hanya membuat surface untuk ukuran yang diminta
+            sprites[name] = pygame.image.frombytes(payload[offset:offset + byte_count], (size, size), 'RGBA')
+        offset += byte_count
+    if len(sprites) != len(SPRITE_SOURCES):
+        raise ValueError(f"Sprite pack has no complete set for tile size {tile_size}")
+    return sprites
+
+def load_source_sprites(tile_size):
+    # Mendekode gambar sumber resolusi penuh lalu menskalakannya (lambat)
+    return {
+        name: pygame.transform.scale(pygame.image.load(os.path.join(ASSET_DIR, source)), (tile_size, tile_size))
+        for name, source in SPRITE_SOURCES.items()
+    }
+
+_sprite_cache = {}  # Sprite yang sudah dimuat per ukuran tile
+
+def get_sprites(tile_size=TILE_SIZE):
+    # Mengambil sprite untuk ukuran tile tertentu, dimuat hanya sekali
+    sprites = _sprite_cache.get(tile_size)
+    if sprites is None:
+        use_pack = os.environ.get('MAZE_SPRITE_PACK', '1') != '0'
+        sprites = None
+        if use_pack and os.path.exists(SPRITE_PACK_PATH):
+            try:
+                sprites = read_sprite_pack(SPRITE_PACK_PATH, tile_size)
+            except (ValueError, struct.error, zlib.error) as error:
+                print(f" Warning: {error}; loading source images instead")  # Sekali per ukuran tile
+        if sprites is None:
+            sprites = load_source_sprites(tile_size)  # Cadangan jika paket belum dibuat atau usang
+        for name in [name for name in sprites if name.startswith(('player', 'guard'))]:
+            sprites[f'{name}_left'] = pygame.transform.flip(sprites[name], True, False)  # Dibalik sekali, bukan setiap tick
+        _sprite_cache[tile_size] = sprites
+    return sprites
+
+# Rekaman input untuk replay deterministik
+REPLAY_MAGIC = b'MZRP'  # Penanda format rekaman
+REPLAY_VERSION = 5  # Versi format rekaman (naik jika aturan gerak berubah)
+DIFFICULTIES = ('easy', 'medium', 'hard')  # Urutan kode kesulitan di rekaman
+OUTCOME_CAUGHT = 'caught'  # Pemain tertangkap penjaga
+OUTCOME_FINISHED = 'finished'  # Pemain mencapai garis finish
+OUTCOMES = (None, OUTCOME_CAUGHT, OUTCOME_FINISHED)  # Urutan kode hasil di rekaman
+INPUT_KEYS = ('K_UP', 'K_DOWN', 'K_LEFT', 'K_RIGHT')  # Tombol yang direkam, satu bit per tombol
+
+def encode_keys(keys):
+    # Mengubah hasil pygame.key.get_pressed() menjadi bitmask 4 bit
+    bits = 0
+    for bit, name in enumerate(INPUT_KEYS):
+        if keys[getattr(pygame, name)]:
+            bits |= 1 << bit
+    return bits
+
+def decode_keys(bits):
+    # Mengubah bitmask menjadi pengganti pygame.key.get_pressed()
+    return {getattr(pygame, name): bool(bits >> bit & 1) for bit, name in enumerate(INPUT_KEYS)}
+
+class InputLog:
+    def __init__(self, difficulty, seed, inputs=None, hashes=None, outcome=None):
+        self.difficulty = difficulty  # Tingkat kesulitan ronde
+        self.seed = seed  # Seed RNG ronde
+        self.inputs = inputs if inputs is not None else bytearray()  # Bitmask input per tick
+        self.hashes = hashes if hashes is not None else []  # Hash status game setelah setiap tick
+        self.outcome = outcome  # Hasil akhir ronde
+
+    def record(self, keys, state_hash):
+        self.inputs.append(encode_keys(keys))  # Menyimpan input tick ini
+        self.hashes.append(state_hash)  # Menyimpan hash status setelah tick ini
+
+    def save(self, path):
+        # Dua tick per byte untuk input, lalu hash 32-bit per tick, semuanya dikompresi
+        packed = bytearray((len(self.inputs) + 1) // 2)
+        for tick, bits in enumerate(self.inputs):
+            packed[tick // 2] |= bits << (4 * (tick % 2))
+        body = bytes(packed) + struct.pack(f'<{len(self.hashes)}I', *self.hashes)
+        with open(path, 'wb') as log_file:
+            log_file.write(struct.pack('<4sBBBxII', REPLAY_MAGIC, REPLAY_VERSION, DIFFICULTIES.index(self.difficulty),
+                                       OUTCOMES.index(self.outcome), self.seed, len(self.inputs)))
+            log_file.write(zlib.compress(body, 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as log_file:
+            magic, version, difficulty, outcome, seed, ticks = struct.unpack('<4sBBBxII', log_file.read(16))
+            if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+                raise ValueError(f"Unsupported replay file: {path}")
+            body = zlib.decompress(log_file.read())
+        packed_length = (ticks + 1) // 2
+        inputs = bytearray(body[tick // 2] >> (4 * (tick % 2)) & 0xF for tick in range(ticks))
+        hashes = list(struct.unpack_from(f'<{ticks}I', body, packed_length))
+        return cls(DIFFICULTIES[difficulty], seed, inputs, hashes, OUTCOMES[outcome])
+
+# Snapshot status game dengan layout tetap untuk Retry, simpan/muat dan rewind
+SNAPSHOT_MAGIC = b'MZSS'  # Penanda format snapshot
+SNAPSHOT_VERSION = 2  # Versi format snapshot
+SNAPSHOT_HEADER = struct.Struct('<4sBBBxIIdH')  # Penanda, versi, kesulitan, jumlah penjaga, seed, tick, jam, bintang
+PLAYER_RECORD = struct.Struct('<iiBBd')  # x, y, frame, menghadap kiri, waktu animasi terakhir
+GUARD_RECORD = struct.Struct('<ddBBdIbbBBddHhhhh')  # x, y, frame, menghadap kiri, waktu animasi, tick AI, arah, waypoint,
+                                                  # status, indeks patroli, tile awal, tile pemain terakhir terlihat
+SAVE_PATH = os.environ.get('MAZE_SAVE_PATH', os.path.join(ASSET_DIR, 'quicksave.mzs'))  # File simpan cepat (F5 simpan, F9 muat)
+REWIND_INTERVAL = 15  # Snapshot rewind diambil setiap sekian tick
+REWIND_DEPTH = 40  # Jumlah snapshot rewind yang disimpan (10 detik pada 60 tick per detik)
+
+# Ring buffer snapshot untuk mundur (Backspace); beberapa tekanan berturut-turut mundur makin jauh
+class RewindBuffer:
+    def __init__(self, depth=REWIND_DEPTH, interval=REWIND_INTERVAL):
+        self.snapshots = deque(maxlen=depth)
+        self.interval = interval  # Snapshot diambil setiap sekian tick
+        self.rewound_to = None  # Tick tujuan rewind terakhir; snapshot-nya sudah dipakai dan tidak diambil ulang
+
+    def __bool__(self):
+        return bool(self.snapshots)
+
+    def record(self, game):
+        # Dipanggil sebelum setiap tick agar snapshot selalu lebih awal dari sekarang
+        if game.tick_count % self.interval == 0 and game.tick_count != self.rewound_to:
+            self.snapshots.append(game.snapshot())
+
+    def rewind(self, game):
+        # Memulihkan snapshot terbaru dan membuangnya; tekanan berikutnya memakai snapshot sebelumnya
+        game.restore(self.snapshots.pop())
+        self.rewound_to = game.tick_count
+
+    def clear(self):
+        self.snapshots.clear()
+        self.rewound_to = None
+
+def needs_menu_redraw(event, buttons):
+    # Menentukan apakah event mengubah tampilan menu
+    if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+        return True  # Jendela perlu digambar ulang oleh sistem
+    if event.type == pygame.MOUSEMOTION:
+        changed = False
+        for button in buttons:
+            if button is not None and button.update_hover(event.pos):
+                changed = True  # Status hover berubah
+        return changed
+    return False
+
+# Lapisan gambar, digambar dari nilai kecil ke besar
+LAYER_MAZE = 0  # Dinding dan garis finish
+LAYER_ITEMS = 1  # Bintang
+LAYER_CHARACTERS = 2  # Pemain dan penjaga
+LAYER_OVERLAY = 3  # Tampilan di atas permainan
+
+# Mengumpulkan perintah gambar satu frame lalu mengirimnya dalam satu Surface.blits()
+class RenderQueue:
+    def __init__(self):
+        self._layers = {}  # Daftar (surface, posisi) per lapisan
+
+    def add(self, layer, surface, position):
+        self._layers.setdefault(layer, []).append((surface, position))
 
-# Font untuk judul dan tombol
-title_font = pygame.font.Font(None, 74)
-button_font = pygame.font.Font(None, 50)
+    def extend(self, layer, commands):
+        self._layers.setdefault(layer, []).extend(commands)
+
+    def flush(self, target):
+        # Urut per lapisan, lalu per tekstur di dalam lapisan agar blit berurutan memakai surface yang sama
+        batch = []
+        for layer in sorted(self._layers):
+            commands = self._layers[layer]
+            commands.sort(key=lambda command: id(command[0]))
+            batch += commands
+        target.blits(batch, doreturn=False)
+        self._layers.clear()
+
+render_queue = RenderQueue()  # Antrian gambar global untuk layar permainan
+
+# Jam game yang dimajukan sekali per tick dan dibagikan ke semua entitas
+class RealTimeClock:
+    def __init__(self):
+        self.now = time.perf_counter()  # Waktu tick saat ini (detik)
+
+    def advance(self):
+        self.now = time.perf_counter()  # Satu pembacaan waktu per tick
+        return self.now
+
+    def reset(self):
+        self.now = time.perf_counter()
+
+# Jam simulasi: waktu maju tetap per tick, tidak bergantung pada waktu nyata
+class SimulatedClock:
+    def __init__(self, step=1 / 60):
+        self.step = step  # Lama satu tick (detik)
+        self.now = 0.0  # Waktu simulasi saat ini (detik)
+
+    def advance(self):
+        self.now += self.step
+        return self.now
+
+    def reset(self):
+        self.now = 0.0
+
+# Mengukur jumlah tick logika per detik nyata untuk tampilan mode turbo
+class TickRateMeter:
+    def __init__(self, interval=0.5):
+        self.interval = interval  # Lama jendela pengukuran (detik)
+        self.rate = 0.0  # Tick per detik pada jendela terakhir
+        self._ticks = 0
+        self._start = time.perf_counter()
+        self._label = None  # (teks, surface) terakhir
+
+    def count(self, ticks):
+        self._ticks += ticks
+        now = time.perf_counter()
+        if now - self._start >= self.interval:
+            self.rate = self._ticks / (now - self._start)
+            self._ticks = 0
+            self._start = now
+
+    def render(self, prefix):
+        # Dirender langsung, bukan lewat text_cache, karena angkanya terus berubah
+        text = f"{prefix}  {self.rate:,.0f} ticks/s"
+        if self._label is None or self._label[0] != text:
+            self._label = (text, get_font(HUD_FONT_SIZE).render(text, True, YELLOW))
+        return self._label[1]
+
+# Atlas glyph: setiap karakter dirender sekali ke satu surface, teks disusun dengan blit sub-rect
+class GlyphAtlas:
+    def __init__(self, font, chars, color):
+        glyphs = [font.render(char, True, color) for char in chars]
+        self.height = max(glyph.get_height() for glyph in glyphs)  # Tinggi satu baris teks
+        self.surface = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.height), pygame.SRCALPHA)
+        self._rects = {}  # Karakter -> area di atlas
+        x = 0
+        for char, glyph in zip(chars, glyphs):
+            self.surface.blit(glyph, (x, 0))
+            self._rects[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+    def width(self, text):
+        return sum(self._rects[char].width for char in text)
+
+    def compose(self, target, text, old_text=''):
+        # Hanya glyph yang berubah dari old_text yang digambar ulang; karakter di luar atlas tidak boleh dipakai
+        commands = []
+        x = 0
+        aligned = True  # Posisi karakter masih sama dengan teks lama
+        for index, char in enumerate(text):
+            rect = self._rects[char]
+            old_char = old_text[index] if index < len(old_text) else None
+            if aligned and old_char is not None and self._rects[old_char].width != rect.width:
+                aligned = False  # Lebar berbeda menggeser sisa teks
+                target.fill((0, 0, 0, 0), (x, 0, target.get_width() - x, self.height))
+            if not aligned or char != old_char:
+                if aligned:
+                    target.fill((0, 0, 0, 0), (x, 0, rect.width, self.height))
+                commands.append((self.surface, (x, 0), rect))
+            x += rect.width
+        if aligned and len(old_text) > len(text):  # Sisa teks lama yang lebih panjang dihapus
+            target.fill((0, 0, 0, 0), (x, 0, target.get_width() - x, self.height))
+        target.blits(commands, doreturn=False)
+
+# HUD permainan (waktu, bintang, FPS); hanya disusun ulang jika nilai yang ditampilkan berubah
+class Hud:
+    def __init__(self):
+        self._atlas = None  # Dibuat saat pertama digambar agar game tanpa layar tidak memuat font
+        self._surface = None  # Hasil susunan terakhir
+        self._values = None  # Nilai yang ditampilkan di _surface
+        self._text = ''  # Teks yang ditampilkan di _surface
+        self.redraws = 0  # Jumlah penyusunan ulang (untuk profil)
+
+    def render(self, ticks, stars, total_stars, fps):
+        tenths = ticks * 10 // TICKS_PER_SECOND  # Waktu ronde dalam persepuluh detik
+        values = (tenths, stars, total_stars, round(fps))
+        if values != self._values:
+            if self._atlas is None:
+                self._atlas = GlyphAtlas(get_font(HUD_FONT_SIZE), HUD_GLYPHS, YELLOW)
+            minutes, tenths = divmod(tenths, 600)
+            text = f"TIME {minutes}:{tenths // 10:02d}.{tenths % 10}   STARS {stars}/{total_stars}   FPS {values[3]}"
+            width = self._atlas.width(text)
+            if self._surface is None or self._surface.get_width() < width:
+                self._surface = pygame.Surface((width, self._atlas.height), pygame.SRCALPHA)
+                self._text = ''  # Surface baru kosong, semua glyph digambar
+            self._atlas.compose(self._surface, text, self._text)
+            self._values = values
+            self._text = text
+            self.redraws += 1
+        return self._surface
+
+hud = Hud()  # HUD global untuk layar permainan
 
 # Kelas abstrak untuk entitas game
 class GameEntity(ABC):
@@ -39,7 +536,11 @@ class GameEntity(ABC):
 
 # Kelas untuk karakter pemain
 class Character(GameEntity):
-    def __init__(self, x, y, speed):
+    def __init__(self, x, y, speed, game_clock=None):
+        self.reset(x, y, speed, game_clock)
+
+    def reset(self, x, y, speed, game_clock=None):
+        # Mengembalikan karakter ke keadaan awal; dipakai juga oleh ObjectPool saat objek dipakai ulang
         self._x = x  # Posisi x karakter
         self._y = y  # Posisi y karakter
         self._speed = speed  # Kecepatan karakter
@@ -47,7 +548,8 @@ class Character(GameEntity):
         self.direction = 'right'  # Arah awal
         self.frame_index = 0  # Indeks frame animasi
         self.animation_speed = 0.1  # Kecepatan animasi
-        self.last_update_time = time.time()  # Waktu pembaruan terakhir
+        self.game_clock = game_clock if game_clock is not None else RealTimeClock()  # Jam game bersama
+        self.last_update_time = self.game_clock.now  # Waktu pembaruan terakhir
 
     def draw(self):
         pass  # Metode untuk menggambar karakter (diimplementasikan di subclass)
@@ -59,6 +561,46 @@ class Character(GameEntity):
         pass  # Metode untuk memperbarui status karakter (diimplementasikan di subclass)
 
 # Kelas untuk labirin
+def line_of_sight(layout, start, end):
+    # Garis dari tengah tile ke tengah tile; semua tile yang dilewati harus lantai.
+    # Garis yang tepat melewati sudut butuh kedua tile di samping sudut itu terbuka.
+    (x, y), (end_x, end_y) = start, end
+    steps_x, steps_y = abs(end_x - x), abs(end_y - y)
+    sign_x = 1 if end_x > x else -1
+    sign_y = 1 if end_y > y else -1
+    done_x = done_y = 0
+    while done_x < steps_x or done_y < steps_y:
+        decision = (1 + 2 * done_x) * steps_y - (1 + 2 * done_y) * steps_x
+        if decision == 0:
+            if layout[y][x + sign_x] or layout[y + sign_y][x]:
+                return False
+            x += sign_x
+            y += sign_y
+            done_x += 1
+            done_y += 1
+        elif decision < 0:
+            x += sign_x
+            done_x += 1
+        else:
+            y += sign_y
+            done_y += 1
+        if layout[y][x]:
+            return False
+    return True
+
+def visible_tiles(layout, tile, reach=GUARD_VIEW_RANGE):
+    # Tile lantai dalam jarak pandang yang punya garis pandang dari tile; biayanya tetap, berapa pun ukuran labirin
+    tile_x, tile_y = tile
+    if layout[tile_y][tile_x] != 0:
+        return frozenset()
+    seen = []
+    for y in range(max(0, tile_y - reach), min(len(layout), tile_y + reach + 1)):
+        row = layout[y]
+        for x in range(max(0, tile_x - reach), min(len(row), tile_x + reach + 1)):
+            if row[x] == 0 and line_of_sight(layout, tile, (x, y)):
+                seen.append((x, y))
+    return frozenset(seen)
+
 class Maze(GameEntity):
     def __init__(self):
         # Layout labirin menggunakan 1 untuk dinding dan 0 untuk ruang kosong
@@ -79,6 +621,13 @@ class Maze(GameEntity):
             [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
             [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
         ]
+        self._static_blits = None  # Cache perintah gambar dinding, dibuat saat pertama digambar
+        self.layout_version = 0  # Naik setiap kali layout berubah lewat set_tile()
+        self._layout_listeners = []  # Fungsi yang dipanggil saat sebuah tile berubah
+        self.pathfinder = None  # Pencari jalur untuk penjaga (None = Guard.bfs)
+        self.path_queue = None  # Antrian permintaan jalur dengan anggaran per tick (None = langsung)
+        self._visibility = {}  # Tile -> frozenset tile yang terlihat, dihitung sekali per tile dan layout
+        self._patrol_routes = {}  # Tile awal -> rute patroli, dihitung sekali per layout
         self.reset_stars()  # Memanggil metode untuk mereset status bintang
         # Posisi bintang yang harus dikumpulkan
         self._star_positions = [
@@ -87,27 +636,152 @@ class Maze(GameEntity):
             (15 * TILE_SIZE, 5 * TILE_SIZE) 
         ]
         self._stars_collected = [False, False, False]  # Status pengumpulan bintang
-        # Memuat gambar dinding dan bintang
-        self.wall_image = pygame.transform.scale(pygame.image.load('wall.jpg'), (TILE_SIZE, TILE_SIZE)) 
-        self.star_image = pygame.transform.scale(pygame.image.load('star.png'), (TILE_SIZE, TILE_SIZE)) 
+
+    @property
+    def wall_image(self):
+        return get_sprites()['wall']  # Gambar dinding dimuat saat pertama kali digambar
+
+    @property
+    def star_image(self):
+        return get_sprites()['star']  # Gambar bintang dimuat saat pertama kali digambar
+
+    def add_layout_listener(self, listener):
+        self._layout_listeners.append(listener)  # listener(x, y, nilai_baru)
+
+    def set_tile(self, x, y, value):
+        # Mengubah tile menjadi dinding (1) atau lantai (0), misalnya untuk pintu atau dinding yang bisa dihancurkan
+        if self._layout[y][x] == value:
+            return
+        self._layout[y][x] = value
+        self.layout_version += 1
+        self._static_blits = None  # Gambar dinding harus disusun ulang
+        self._visibility.clear()  # Garis pandang dan rute patroli dihitung ulang
+        self._patrol_routes.clear()
+        for listener in self._layout_listeners:
+            listener(x, y, value)
 
     def reset_stars(self):
         self._stars_collected = [False, False, False]  # Status pengumpulan bintang direset
 
+    def visible_from(self, tile):
+        # Tile yang terlihat dari tile ini; "bisakah penjaga melihat pemain" cukup satu pencarian set
+        seen = self._visibility.get(tile)
+        if seen is None:  # Dihitung saat tile pertama kali ditanya, lalu hanya lookup
+            seen = visible_tiles(self._layout, tile)
+            self._visibility[tile] = seen
+        return seen
+
+    def patrol_route(self, home):
+        # Rute bolak-balik dari home ke tile terjauh dalam PATROL_REACH langkah, sebagai siklus tile bertetangga
+        route = self._patrol_routes.get(home)
+        if route is None:
+            layout = self._layout
+            parent = {home: None}
+            frontier = [home]
+            farthest = home
+            for _ in range(PATROL_REACH):
+                next_frontier = []
+                for x, y in frontier:
+                    for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:  # Urutan tetangga yang sama dengan Guard.bfs
+                        neighbor = (x + dx, y + dy)
+                        if (0 <= neighbor[0] < len(layout[0]) and 0 <= neighbor[1] < len(layout) and
+                                layout[neighbor[1]][neighbor[0]] == 0 and neighbor not in parent):
+                            parent[neighbor] = (x, y)
+                            next_frontier.append(neighbor)
+                if not next_frontier:
+                    break
+                frontier = next_frontier
+                farthest = frontier[0]
+            forward = []
+            tile = farthest
+            while tile is not None:
+                forward.append(tile)
+                tile = parent[tile]
+            forward.reverse()
+            route = tuple(forward + forward[-2:0:-1])  # Pulang lewat jalan yang sama, tanpa mengulang ujungnya
+            self._patrol_routes[home] = route
+        return route
+
+    def static_blits(self):
+        # Perintah gambar dinding dan tujuan, dihitung sekali per layout
+        if self._static_blits is None:
+            wall_image = self.wall_image
+            blits = []
+            for row_idx, row in enumerate(self._layout):
+                for col_idx, tile in enumerate(row):
+                    if tile == 1:  # Jika tile adalah dinding
+                        blits.append((wall_image, (col_idx * TILE_SIZE, row_idx * TILE_SIZE)))
+
+            # Tujuan (kotak hijau)
+            goal_image = pygame.Surface((TILE_SIZE, TILE_SIZE))
+            goal_image.fill(GREEN)
+            blits.append((goal_image, (19 * TILE_SIZE, 7 * TILE_SIZE)))
+            self._static_blits = blits
+        return self._static_blits
+
     def draw(self):
         # Menggambar labirin
-        for row_idx, row in enumerate(self._layout):
-            for col_idx, tile in enumerate(row):
-                if tile == 1:  # Jika tile adalah dinding
-                    screen.blit(self.wall_image, (col_idx * TILE_SIZE, row_idx * TILE_SIZE)) 
-
-        # Menggambar tujuan (kotak hijau)
-        pygame.draw.rect(screen, GREEN, (19 * TILE_SIZE, 7 * TILE_SIZE, TILE_SIZE, TILE_SIZE))  
+        render_queue.extend(LAYER_MAZE, self.static_blits())
 
         # Menggambar bintang yang belum dikumpulkan
+        star_image = self.star_image
         for index, position in enumerate(self._star_positions):
             if not self._stars_collected[index]:
-                screen.blit(self.star_image, position)
+                render_queue.add(LAYER_ITEMS, star_image, position)
+
+    def _blocked(self, columns, rows):
+        # True jika salah satu tile pada rentang ini adalah dinding atau di luar labirin
+        for row in range(rows[0], rows[1] + 1):
+            for column in range(columns[0], columns[1] + 1):
+                if not (0 <= column < len(self._layout[0]) and 0 <= row < len(self._layout)) or self._layout[row][column] != 0:
+                    return True
+        return False
+
+    def sweep_box(self, x, y, dx, dy, size=TILE_SIZE):
+        # Bagian perpindahan yang bisa ditempuh kotak sebelum menyentuh dinding, sebagai (pembilang, penyebut).
+        # Hanya tile yang dilewati yang diperiksa, jadi biayanya sebanding dengan jarak, bukan kecepatan.
+        # Posisi dan perpindahan bilangan bulat, jadi semua waktu memakai penyebut yang sama dan tetap eksak.
+        scale = (abs(dx) or 1) * (abs(dy) or 1)  # Penyebut bersama untuk waktu di kedua sumbu
+
+        def span(start, delta, t):
+            # Tile yang ditutupi kotak pada satu sumbu sesaat setelah waktu t / scale
+            low = start * scale + delta * t  # Posisi dikali scale
+            cell = TILE_SIZE * scale
+            if delta > 0:
+                return low // cell, (low + size * scale) // cell
+            if delta < 0:
+                return -(-low // cell) - 1, -(-(low + size * scale) // cell) - 1
+            return low // cell, -(-(low + size * scale) // cell) - 1
+
+        # Waktu (dikali scale) ketika sisi depan kotak memasuki kolom atau baris baru
+        events = []
+        for axis, start, delta in ((0, x, dx), (1, y, dy)):
+            step = scale // (abs(delta) or 1)  # Pembilang dikali agar penyebutnya menjadi scale
+            if delta > 0:
+                boundary = (start + size) // TILE_SIZE * TILE_SIZE + TILE_SIZE
+                while boundary < start + size + delta:
+                    events.append(((boundary - start - size) * step, axis))
+                    boundary += TILE_SIZE
+            elif delta < 0:
+                boundary = -(-start // TILE_SIZE) * TILE_SIZE - TILE_SIZE
+                while boundary > start + delta:
+                    events.append(((start - boundary) * step, axis))
+                    boundary -= TILE_SIZE
+        events.sort()
+
+        if self._blocked(span(x, dx, 0), span(y, dy, 0)):
+            return 0, scale  # Sudah menempel dinding ke arah gerakan
+        for t, axis in events:
+            columns, rows = span(x, dx, t), span(y, dy, t)
+            if axis == 0:
+                column = columns[1] if dx > 0 else columns[0]  # Hanya kolom yang baru dimasuki
+                if self._blocked((column, column), rows):
+                    return t, scale
+            else:
+                row = rows[1] if dy > 0 else rows[0]  # Hanya baris yang baru dimasuki
+                if self._blocked(columns, (row, row)):
+                    return t, scale
+        return scale, scale
 
     def collect_star(self, player_position):
         # Mengumpulkan bintang jika pemain berada di posisi yang sama
@@ -120,21 +794,22 @@ class Maze(GameEntity):
 
 # Kelas untuk pemain
 class Player(Character):
-    def __init__(self, x, y, speed):
-        super().__init__(x, y, speed)  # Memanggil konstruktor kelas induk
-        self.player_images = []  # Daftar gambar untuk animasi pemain
-        
-        # Memuat gambar untuk animasi pemain
-        for i in range(1, 5):
-            self.player_images.append(pygame.transform.scale(pygame.image.load(f'imgp/{i}.png'), (TILE_SIZE, TILE_SIZE)))
+    def __init__(self, x, y, speed, game_clock=None):
+        sprites = get_sprites()
+        self.player_images = [sprites[f'player{i}'] for i in range(1, ANIMATION_FRAMES + 1)]  # Daftar gambar untuk animasi pemain
+        self.player_images_left = [sprites[f'player{i}_left'] for i in range(1, ANIMATION_FRAMES + 1)]  # Gambar menghadap kiri
+        super().__init__(x, y, speed, game_clock)  # Memanggil konstruktor kelas induk
 
-        self.current_image = self.player_images[0]  # Gambar saat ini
+    def reset(self, x, y, speed, game_clock=None):
+        super().reset(x, y, speed, game_clock)
+        self.current_image = self.player_images[0]  # Gambar saat ini (daftar sprite tetap dipakai)
+        self.exit_locked = False  # Berada di garis finish tanpa semua bintang pada tick terakhir
 
     def draw(self):
-        screen.blit(self.current_image, (self._x, self._y))  # Menggambar pemain di posisi saat ini
+        render_queue.add(LAYER_CHARACTERS, self.current_image, (self._x, self._y))  # Menggambar pemain di posisi saat ini
 
     def update_animation(self):
-        current_time = time.time()  # Mendapatkan waktu saat ini
+        current_time = self.game_clock.now  # Mendapatkan waktu tick saat ini
         if current_time - self.last_update_time >= self.animation_speed:  # Memeriksa apakah sudah waktunya untuk memperbarui animasi
             self.frame_index = (self.frame_index + 1) % len(self.player_images)  # Mengupdate indeks frame
             self.current_image = self.player_images[self.frame_index]  # Mengatur gambar saat ini
@@ -151,7 +826,7 @@ class Player(Character):
             new_y += self._speed
         if keys[pygame.K_LEFT]:
             new_x -= self._speed
-            self.current_image = pygame.transform.flip(self.player_images[self.frame_index], True, False)  # Membalik gambar untuk arah kiri
+            self.current_image = self.player_images_left[self.frame_index]  # Gambar untuk arah kiri
             moving = True
         if keys[pygame.K_RIGHT]:
             new_x += self._speed
@@ -167,58 +842,109 @@ class Player(Character):
         if new_x + TILE_SIZE > WIDTH:
             new_x = WIDTH - TILE_SIZE
 
-        # Memeriksa apakah posisi baru valid dalam labirin
-        top_left = (new_x // TILE_SIZE, new_y // TILE_SIZE)
-        top_right = ((new_x + TILE_SIZE - 1) // TILE_SIZE, new_y // TILE_SIZE)
-        bottom_left = (new_x // TILE_SIZE, (new_y + TILE_SIZE - 1) // TILE_SIZE)
-        bottom_right = ((new_x + TILE_SIZE - 1) // TILE_SIZE, (new_y + TILE_SIZE - 1) // TILE_SIZE)
-
-        if all(0 <= pos[0] < len(maze._layout[0]) and 0 <= pos[1] < len(maze._layout) for pos in [top_left, top_right, bottom_left, bottom_right]):
-            if all(maze._layout[pos[1]][pos[0]] == 0 for pos in [top_left, top_right, bottom_left, bottom_right]):
-                self._x, self._y = new_x, new_y  # Memperbarui posisi pemain
-
-        # Mengumpulkan bintang jika pemain berada di posisi yang sama
-        for index, position in enumerate(maze._star_positions):
-            if not maze._stars_collected[index] and (self._x, self._y) == position:
-                maze.collect_star((self._x, self._y))
-
-        # Memeriksa apakah pemain telah mencapai tujuan
+        # Bergerak sampai menyentuh dinding; tile yang dilewati diperiksa sehingga kecepatan tinggi tidak menembus dinding
+        start_x, start_y = self._x, self._y
+        dx, dy = new_x - start_x, new_y - start_y
+        if dx or dy:
+            num, den = maze.sweep_box(start_x, start_y, dx, dy)
+            self._x, self._y = start_x + dx * num // den, start_y + dy * num // den  # Memperbarui posisi pemain
+
+        # Mengumpulkan bintang yang dilewati atau ditempati pemain pada langkah ini
+        for index, (star_x, star_y) in enumerate(maze._star_positions):
+            if not maze._stars_collected[index] and \
+                    (self._x - start_x) * (star_y - start_y) == (self._y - start_y) * (star_x - start_x) and \
+                    min(start_x, self._x) <= star_x <= max(start_x, self._x) and \
+                    min(start_y, self._y) <= star_y <= max(start_y, self._y):
+                maze.collect_star((star_x, star_y))
+
+        # Memeriksa apakah pemain telah mencapai tujuan; pesan dilaporkan oleh play_game, bukan setiap tick
+        self.exit_locked = False
         if new_x + TILE_SIZE >= WIDTH:
             if all(maze._stars_collected):
-                print("Selamat! Anda telah mencapai garis finish!")  # Pesan kemenangan
-                game.finish_menu()  # Menampilkan menu akhir
-            else:
-                print("Anda harus mengumpulkan bintangnya terlebih dahulu!")  # Pesan jika belum mengumpulkan bintang
+                return True  # Pemain menang
+            self.exit_locked = True  # Bintang belum terkumpul semua
+        return False
 
 # Kelas untuk tombol
 class Button:
     def __init__(self, x, y, width, height, text, color, text_color):
         self.rect = pygame.Rect(x, y, width, height)  # Membuat rectangle untuk tombol
-        self.text = text  # Teks tombol
-        self.color = color  # Warna tombol
-        self.text_color = text_color  # Warna teks tombol
+        self._text = text  # Teks tombol
+        self._color = color  # Warna tombol
+        self._text_color = text_color  # Warna teks tombol
+        self._label = None  # Surface teks yang sudah dirender
+        self.hovered = False  # Status apakah kursor berada di atas tombol
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        if value != self._text:
+            self._text = value
+            self._label = None  # Label harus dirender ulang
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        self._color = value  # Warna latar tidak mempengaruhi label
+
+    @property
+    def text_color(self):
+        return self._text_color
+
+    @text_color.setter
+    def text_color(self, value):
+        if value != self._text_color:
+            self._text_color = value
+            self._label = None  # Label harus dirender ulang
 
     def draw(self):
-        pygame.draw.rect(screen, self.color, self.rect)  # Menggambar tombol
-        text_surface = button_font.render(self.text, True, self.text_color)  # Membuat surface untuk teks
-        text_rect = text_surface.get_rect(center=self.rect.center)  # Mengatur posisi teks di tengah tombol
-        screen.blit(text_surface, text_rect)  # Menggambar teks di tombol
+        pygame.draw.rect(screen, self._color, self.rect)  # Menggambar tombol
+        if self._label is None:  # Render label hanya jika teks atau warna berubah
+            self._label = text_cache.render(get_font(BUTTON_FONT_SIZE), self._text, self._text_color)
+        text_rect = self._label.get_rect(center=self.rect.center)  # Mengatur posisi teks di tengah tombol
+        screen.blit(self._label, text_rect)  # Menggambar teks di tombol
+        if self.hovered:
+            pygame.draw.rect(screen, WHITE, self.rect, 3)  # Menggambar bingkai saat kursor di atas tombol
+
+    def update_hover(self, mouse_pos):
+        hovered = bool(self.rect.collidepoint(mouse_pos))  # Memeriksa apakah kursor di atas tombol
+        changed = hovered != self.hovered
+        self.hovered = hovered
+        return changed  # True jika tombol perlu digambar ulang
 
     def is_clicked(self, mouse_pos):
         return self.rect.collidepoint(mouse_pos)  # Memeriksa apakah tombol diklik
 
 # Kelas untuk penjaga
 class Guard(Character):
-    def __init__(self, x, y, speed):
-        super().__init__(x, y, speed)  # Memanggil konstruktor kelas induk
-        self.guard_images = [] # Daftar gambar untuk animasi penjaga
-        for i in range(1, 5):
-            self.guard_images.append(pygame.transform.scale(pygame.image.load(f'imgg/{i}.png'), (TILE_SIZE, TILE_SIZE)))
-
+    def __init__(self, x, y, speed, game_clock=None):
+        sprites = get_sprites()
+        self.guard_images = [sprites[f'guard{i}'] for i in range(1, ANIMATION_FRAMES + 1)]  # Daftar gambar untuk animasi penjaga
+        self.guard_images_left = [sprites[f'guard{i}_left'] for i in range(1, ANIMATION_FRAMES + 1)]  # Gambar menghadap kiri
+        self.path = deque()  # Sisa waypoint (tile) dari perencanaan terakhir, dipakai ulang untuk setiap jalur
+        super().__init__(x, y, speed, game_clock)  # Memanggil konstruktor kelas induk
+
+    def reset(self, x, y, speed, game_clock=None):
+        super().reset(x, y, speed, game_clock)
         self.current_image = self.guard_images[0]  # Gambar saat ini
         self.slow_speed = speed  # Kecepatan penjaga
-
-    def bfs(self, layout, start, goal):
+        self.path.clear()
+        self.target = None  # Waypoint yang sedang dituju (piksel), None di batas tile
+        self.last_ai_tick = 0  # Tick terakhir penjaga ini di-update oleh AIScheduler
+        self.heading = None  # Arah langkah terakhir (dx, dy), dipakai jika jalur baru belum siap
+        self.state = GUARD_PATROL  # Status perilaku penjaga
+        self.home = (int(x) // TILE_SIZE, int(y) // TILE_SIZE)  # Tile awal, pusat rute patroli
+        self.patrol_index = 0  # Posisi di rute patroli yang sedang dituju
+        self.last_seen = None  # Tile pemain saat terakhir terlihat
+
+    @staticmethod
+    def bfs(layout, start, goal):
         # Algoritma BFS untuk menemukan jalur dari penjaga ke pemain
         if not (isinstance(start, tuple) and isinstance(goal, tuple)):
             raise ValueError("Start and goal must be tuples.")  # Memastikan start dan goal adalah tuple
@@ -255,112 +981,455 @@ class Guard(Character):
         return path  # Mengembalikan jalur
 
     def draw(self):
-        screen.blit(self.current_image, (self._x, self._y))  # Menggambar penjaga di posisi saat ini
+        render_queue.add(LAYER_CHARACTERS, self.current_image, (self._x, self._y))  # Menggambar penjaga di posisi saat ini
 
     def update_animation(self):
-        current_time = time.time()  # Mendapatkan waktu saat ini
+        current_time = self.game_clock.now  # Mendapatkan waktu tick saat ini
         if current_time - self.last_update_time >= self.animation_speed:  # Memeriksa apakah sudah waktunya untuk memperbarui animasi
             self.frame_index = (self.frame_index + 1) % len(self.guard_images)  # Mengupdate indeks frame
             self.current_image = self.guard_images[self.frame_index]  # Mengatur gambar saat ini
             self.last_update_time = current_time  # Memperbarui waktu terakhir
 
-    def move(self, player, maze):
+    def next_waypoint(self, player, maze):
+        # Dipanggil hanya di batas tile: memperbarui status dari garis pandang lalu mengambil waypoint berikutnya
+        tile = (int(self._x) // TILE_SIZE, int(self._y) // TILE_SIZE)
+        player_tile = (int(player._x) // TILE_SIZE, int(player._y) // TILE_SIZE)
+        if player_tile in maze.visible_from(tile):
+            self.state = GUARD_CHASE
+            self.last_seen = player_tile
+        elif self.state != GUARD_PATROL:
+            self.state = GUARD_SEARCH  # Menuju tempat pemain terakhir terlihat
+            if tile == self.last_seen:
+                self.state = GUARD_PATROL  # Pemain tidak ditemukan: kembali ke rute patroli
+                self.last_seen = None
+
+        if self.state == GUARD_PATROL:
+            route = maze.patrol_route(self.home)
+            if tile == route[self.patrol_index]:  # Di rute: langkah berikutnya sudah diketahui, tanpa pencarian jalur
+                self.patrol_index = (self.patrol_index + 1) % len(route)
+                return self.step_waypoint(tile, route[self.patrol_index])  # Rute satu tile: berjaga di tempat
+            return self.path_waypoint(tile, route[self.patrol_index], maze)  # Kembali ke rute
+        return self.path_waypoint(tile, self.last_seen, maze)
+
+    def step_waypoint(self, tile, next_tile):
+        # Waypoint ke tile tetangga yang sudah diketahui; None jika next_tile adalah tile ini
+        self.path.clear()
+        if next_tile == tile:
+            return None
+        self.heading = (next_tile[0] - tile[0], next_tile[1] - tile[1])
+        return (next_tile[0] * TILE_SIZE, next_tile[1] * TILE_SIZE)
+
+    def path_waypoint(self, tile, goal, maze):
+        # Merencanakan jalur dari tile ke goal dan mengambil waypoint berikutnya
+        if isinstance(maze.pathfinder, NextHopPathfinder):  # Satu lookup tabel, tanpa pencarian dan tanpa antrian
+            return self.step_waypoint(tile, maze.pathfinder.next_tile(tile, goal))
+        if maze.path_queue is not None:
+            path = maze.path_queue.take(self)
+            if path is None or tile not in path:
+                priority = abs(goal[0] - tile[0]) + abs(goal[1] - tile[1])  # Penjaga yang dekat pemain didahulukan
+                maze.path_queue.request(self, tile, goal, priority)
+                path = maze.path_queue.take(self)
+            if path is None or tile not in path:
+                return self.fallback_waypoint(tile, maze)  # Jalur belum siap
+            start = path.index(tile) + 1  # Hasil pencarian dari tile sebelumnya masih bisa dipakai
+        else:
+            path = maze.pathfinder.find_path(tile, goal) if maze.pathfinder is not None else self.bfs(maze._layout, tile, goal)
+            start = 1
+        self.path.clear()  # Deque yang sama dipakai ulang, tanpa salinan jalur
+        self.path.extend(islice(path, start, None))  # Jalur yang diikuti penjaga
+        if not self.path:
+            return None  # Penjaga sudah berada di tile tujuan
+        next_x, next_y = self.path.popleft()
+        self.heading = (next_x - tile[0], next_y - tile[1])
+        return (next_x * TILE_SIZE, next_y * TILE_SIZE)
+
+    def fallback_waypoint(self, tile, maze):
+        # Melanjutkan sisa jalur lama, atau arah terakhir, sampai pencarian baru selesai
+        layout = maze._layout
+        candidates = []
+        if self.path:
+            candidates.append(self.path[0])
+        if self.heading is not None:
+            candidates.append((tile[0] + self.heading[0], tile[1] + self.heading[1]))
+        for next_x, next_y in candidates:
+            if abs(next_x - tile[0]) + abs(next_y - tile[1]) == 1 and \
+                    0 <= next_x < len(layout[0]) and 0 <= next_y < len(layout) and layout[next_y][next_x] == 0:
+                if self.path and self.path[0] == (next_x, next_y):
+                    self.path.popleft()
+                else:
+                    self.path.clear()
+                self.heading = (next_x - tile[0], next_y - tile[1])
+                return (next_x * TILE_SIZE, next_y * TILE_SIZE)
+        return None  # Tidak ada arah yang aman: menunggu di tempat
+
+    def move(self, player, maze, ticks=1):
         player_x, player_y = player._x, player._y  # Mendapatkan posisi pemain
         guard_x, guard_y = self._x, self._y  # Mendapatkan posisi penjaga
-        
-        possible_moves = []  # Daftar gerakan yang mungkin
-        
-        directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # Arah gerakan
-        for dx, dy in directions:
-            new_x = guard_x + dx
-            new_y = guard_y + dy
-            
-            # Memeriksa apakah gerakan valid
-            if (0 <= new_x // TILE_SIZE < len(maze._layout[0]) and
-                0 <= new_y // TILE_SIZE < len(maze._layout) and
-                maze._layout[new_y // TILE_SIZE][new_x // TILE_SIZE] == 0): 
-                possible_moves.append((new_x, new_y))  # Menambahkan gerakan yang valid ke daftar
-        
-        if possible_moves:
-            self.update_animation()  # Memperbarui animasi jika ada gerakan
-            if (guard_x // TILE_SIZE, guard_y // TILE_SIZE) in possible_moves:
-                self._x, self._y = player_x, player_y  # Jika penjaga berada di posisi yang valid, ikuti pemain
-            else:
-                path = self.bfs(maze._layout, (guard_x // TILE_SIZE, guard_y // TILE_SIZE), (player_x // TILE_SIZE, player_y // TILE_SIZE))  # Mencari jalur ke pemain
-                if len(path) > 1:  # Jika ada jalur yang ditemukan
-                    next_move = path[1]  # Mengambil langkah berikutnya
-                    if self._x < next_move[0] * TILE_SIZE:
-                        self._x += self.slow_speed  # Menggerakkan penjaga ke kanan
-                    elif self._x > next_move[0] * TILE_SIZE:
-                        self._x -= self.slow_speed  # Menggerakkan penjaga ke kiri
-                    if self._y < next_move[1] * TILE_SIZE:
-                        self._y += self.slow_speed  # Menggerakkan penjaga ke bawah
-                    elif self._y > next_move[1] * TILE_SIZE:
-                        self._y -= self.slow_speed  # Menggerakkan penjaga ke atas
-            
-            # Memeriksa apakah pemain tertangkap
-            if (abs(self._x - player_x) < TILE_SIZE / 2 and abs(self._y - player_y) < TILE_SIZE / 2) or \
-            (abs(self._x - player_x) < TILE_SIZE and abs(self._y - player_y) < TILE_SIZE):
-                print("Player caught by the guard!")  # Pesan jika pemain tertangkap
-                game.lose_menu()  # Menampilkan menu kalah
-
-            # Mengatur arah gambar penjaga berdasarkan posisi pemain
-            if player_x < guard_x: 
-                self.current_image = pygame.transform.flip(self.guard_images[self.frame_index], True, False)  # Membalik gambar untuk arah kiri
-                self.direction = 'left'
+
+        caught = False  # Menandakan apakah pemain tertangkap
+        self.update_animation()  # Memperbarui animasi
+
+        # Bergerak menuju waypoint; sisa jarak setelah tiba dipakai untuk waypoint berikutnya
+        budget = self.slow_speed * ticks  # Jarak untuk semua tick sejak update terakhir (boleh pecahan)
+        while budget > 0:
+            if self.target is None:
+                self.target = self.next_waypoint(player, maze)
+                if self.target is None:
+                    break
+            dx = self.target[0] - self._x
+            dy = self.target[1] - self._y
+            distance = abs(dx) + abs(dy)  # Waypoint selalu tetangga lurus, jadi hanya satu sumbu yang berubah
+            if budget >= distance:
+                self._x, self._y = self.target  # Tiba tepat di tile
+                self.target = None
+                budget -= distance
             else:
-                self.current_image = self.guard_images[self.frame_index]  # Mengatur gambar untuk arah kanan
-                self.direction = 'right'
+                self._x += math.copysign(budget, dx) if dx else 0
+                self._y += math.copysign(budget, dy) if dy else 0
+                budget = 0
+
+        # Memeriksa apakah pemain tertangkap
+        if (abs(self._x - player_x) < TILE_SIZE / 2 and abs(self._y - player_y) < TILE_SIZE / 2) or \
+        (abs(self._x - player_x) < TILE_SIZE and abs(self._y - player_y) < TILE_SIZE):
+            caught = True  # Pemain tertangkap; dilaporkan lewat hasil tick
+
+        # Mengatur arah gambar penjaga berdasarkan posisi pemain
+        if player_x < guard_x: 
+            self.current_image = self.guard_images_left[self.frame_index]  # Gambar untuk arah kiri
+            self.direction = 'left'
+        else:
+            self.current_image = self.guard_images[self.frame_index]  # Mengatur gambar untuk arah kanan
+            self.direction = 'right'
+        return caught
 
     def update(self):
         self.move(self.player, self.maze)  # Memperbarui posisi penjaga
         self.update_animation()  # Memperbarui animasi
 
+# Pool objek: memakai ulang karakter antar ronde agar pergantian level hampir tanpa alokasi
+class ObjectPool:
+    def __init__(self, factory):
+        self.factory = factory  # Kelas atau fungsi pembuat objek baru saat pool kosong
+        self._free = []  # Objek yang sudah dikembalikan dan siap dipakai lagi
+        self.hits = 0  # Acquire yang dilayani dari pool
+        self.misses = 0  # Acquire yang harus membuat objek baru (pool bertambah sesuai kebutuhan)
+
+    def acquire(self, *args):
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args)  # Status di-reset, referensi sprite tetap
+            self.hits += 1
+            return obj
+        self.misses += 1
+        return self.factory(*args)
+
+    def release(self, obj):
+        self._free.append(obj)
+
+    def stats(self):
+        return f"{self.hits} hits, {self.misses} misses, {len(self._free)} free"
+
+player_pool = ObjectPool(Player)
+guard_pool = ObjectPool(Guard)
+POOLS = {'Player': player_pool, 'Guard': guard_pool}
+
+def pool_stats():
+    return ", ".join(f"{name} {pool.stats()}" for name, pool in POOLS.items())
+
+# Pelacak memori: snapshot tracemalloc dan jumlah objek per kelas di setiap pergantian layar
+class MemoryTracker:
+    def __init__(self, top=5, frames=1, verbose=True):
+        self.top = top  # Jumlah lokasi alokasi dan kelas yang dilaporkan
+        self.verbose = verbose  # Mencetak laporan di setiap snapshot
+        self.history = deque(maxlen=1000)  # (nama layar, byte yang dilacak) untuk snapshot terakhir
+        self._last = None  # ({lokasi: (byte, blok)}, jumlah objek) terakhir
+        self._baseline = None  # Snapshot yang menjadi titik awal pertumbuhan
+        # Baris milik pelacak ini sendiri tidak dihitung sebagai pertumbuhan game
+        codes = [MemoryTracker._take.__code__, MemoryTracker.snapshot.__code__]
+        self._own_lines = {(code.co_filename, line) for code in codes for _, _, line in code.co_lines() if line}
+        tracemalloc.start(frames)
+
+    def _take(self):
+        # Hanya total per baris yang disimpan; objek Snapshot sendiri akan ikut terlacak dan membengkak
+        ignored = tracemalloc.__file__  # Alokasi milik tracemalloc sendiri tidak dihitung
+        sizes = {stat.traceback[0]: (stat.size, stat.count)
+                 for stat in tracemalloc.take_snapshot().statistics('lineno')
+                 if stat.traceback[0].filename != ignored
+                 and (stat.traceback[0].filename, stat.traceback[0].lineno) not in self._own_lines}
+        counts = {}  # Dict biasa agar alokasinya tercatat di baris pelacak ini, bukan di collections
+        for obj in gc.get_objects():
+            name = type(obj).__name__
+            counts[name] = counts.get(name, 0) + 1
+        return sizes, counts
+
+    def snapshot(self, scene):
+        gc.collect()  # Hanya objek yang benar-benar masih hidup yang dihitung
+        current = self._take()
+        traced = sum(size for size, _ in current[0].values())
+        self.history.append((scene, traced))
+        if self.verbose and self._last is not None:
+            print(self.report(self._last, current, f"{scene} #{len(self.history)}"))
+        self._last = current
+        if self._baseline is None:
+            self.mark_baseline()
+        return traced
+
+    def mark_baseline(self):
+        # Pertumbuhan dihitung dari snapshot terakhir (misalnya setelah pemanasan)
+        self._baseline = self._last
+
+    def growth(self):
+        # Byte yang bertambah sejak baseline
+        return sum(size for size, _ in self._last[0].values()) - sum(size for size, _ in self._baseline[0].values())
+
+    def report(self, old, new, title):
+        old_sizes, old_counts = old
+        new_sizes, new_counts = new
+        old_total = sum(size for size, _ in old_sizes.values())
+        new_total = sum(size for size, _ in new_sizes.values())
+        lines = [f"[memory] {title}: {new_total / 1024:.1f} KiB traced ({(new_total - old_total) / 1024:+.1f} KiB), "
+                 f"gc counts {gc.get_count()}"]
+        lines.append("  top allocation sites:")
+        diffs = []
+        for frame in new_sizes.keys() | old_sizes.keys():
+            new_size, new_blocks = new_sizes.get(frame, (0, 0))
+            old_size, old_blocks = old_sizes.get(frame, (0, 0))
+            if new_size != old_size or new_blocks != old_blocks:
+                diffs.append((new_size - old_size, new_blocks - old_blocks, frame))
+        for size_diff, block_diff, frame in sorted(diffs, key=lambda diff: -abs(diff[0]))[:self.top]:
+            lines.append(f"    {frame.filename}:{frame.lineno}: {size_diff / 1024:+.1f} KiB ({block_diff:+d} blocks)")
+        deltas = Counter(new_counts)
+        deltas.subtract(old_counts)
+        changed = sorted((item for item in deltas.items() if item[1]), key=lambda item: -abs(item[1]))[:self.top]
+        lines.append("  object deltas: " + (", ".join(f"{name} {delta:+d}" for name, delta in changed) or "none"))
+        lines.append("  pools: " + pool_stats())
+        return "\n".join(lines)
+
+    def baseline_report(self, title="since baseline"):
+        return self.report(self._baseline, self._last, title)
+
+    def stop(self):
+        tracemalloc.stop()
+
+memory_tracker = None  # Dibuat saat pergantian layar pertama jika MAZE_MEMORY_TRACE=1
+
+def trace_scene(scene):
+    # Snapshot memori saat berpindah layar (tanpa biaya jika mode pelacakan mati)
+    global memory_tracker
+    if not MEMORY_TRACE:
+        return
+    if memory_tracker is None:
+        memory_tracker = MemoryTracker()
+    memory_tracker.snapshot(scene)
+
+# Penulis telemetri di thread latar: loop game hanya memasukkan event ke antrian terbatas
+class TelemetryWriter:
+    def __init__(self, path, queue_size=TELEMETRY_QUEUE_SIZE, batch=TELEMETRY_BATCH):
+        self.path = path  # File JSONL (ditambahkan, tidak ditimpa)
+        self.batch = batch
+        self.written = 0  # Baris yang sudah ditulis
+        self.dropped = 0  # Event yang dibuang karena antrian penuh (game tidak pernah menunggu I/O)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name='telemetry', daemon=True)
+        self._thread.start()
+
+    def record(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=2.0):
+        # Menulis sisa antrian lalu menghentikan thread (dipanggil otomatis saat program keluar)
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _run(self):
+        with open(self.path, 'a', encoding='utf-8') as log_file:
+            while True:
+                events = [self._queue.get()]  # Menunggu event pertama, lalu mengambil yang sudah mengantri
+                while len(events) < self.batch and events[-1] is not None:
+                    try:
+                        events.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                closing = events[-1] is None
+                lines = [json.dumps(summarize_event(event), separators=(',', ':')) for event in events if event is not None]
+                if closing:
+                    lines.append(json.dumps({'event': 'telemetry_closed', 'written': self.written + len(lines) + 1,
+                                             'dropped': self.dropped}, separators=(',', ':')))
+                log_file.write(''.join(line + '\n' for line in lines))
+                log_file.flush()  # Satu flush per batch
+                self.written += len(lines)
+                if closing:
+                    return
+
+# Histogram waktu frame dengan ukuran tetap: memori per ronde konstan berapa pun lama ronde berjalan
+class FrameHistogram:
+    def __init__(self, step_ms=FRAME_HISTOGRAM_STEP_MS, buckets=FRAME_HISTOGRAM_BUCKETS):
+        self.step = step_ms / 1000  # Lebar bucket (detik)
+        self.counts = array('I', bytes(4 * buckets))  # Jumlah frame per bucket
+        self.frames = 0
+        self.max = 0.0  # Frame terlama, disimpan tepat
+
+    def add(self, seconds):
+        self.counts[min(int(seconds / self.step), len(self.counts) - 1)] += 1
+        self.frames += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        # Batas atas bucket yang memuat frame ke-(fraction * (frames - 1)) setelah diurutkan; tidak melebihi max
+        rank = int(fraction * (self.frames - 1))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen > rank:
+                return min((index + 1) * self.step, self.max)
+        return self.max
+
+def summarize_event(event):
+    # Dijalankan di thread penulis: histogram waktu frame diringkas menjadi persentil (milidetik)
+    histogram = event.pop('frame_histogram', None)
+    if histogram is not None and histogram.frames:
+        event['frames'] = histogram.frames
+        event['frame_ms'] = {name: round(histogram.percentile(fraction) * 1000, 2)
+                             for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99))}
+        event['frame_ms']['max'] = round(histogram.max * 1000, 2)
+    return event
+
+telemetry = None  # Dibuat saat event pertama jika MAZE_TELEMETRY diatur
+
+def record_telemetry(event):
+    # Memasukkan event ke antrian penulis (tanpa biaya jika telemetri mati)
+    global telemetry
+    if not TELEMETRY_PATH:
+        return
+    if telemetry is None:
+        telemetry = TelemetryWriter(TELEMETRY_PATH)
+        atexit.register(telemetry.close)
+    event['time'] = round(time.time(), 3)
+    telemetry.record(event)
+
+# Penjadwal AI: penjaga yang jauh dari pemain di-update lebih jarang, dengan fase yang digeser
+class AIScheduler:
+    def __init__(self, tiers=AI_TIERS):
+        self.tiers = tiers  # (jarak maksimum dalam tile atau None, interval tick) dari dekat ke jauh
+        self.tier_counts = [0] * len(tiers)  # Jumlah penjaga per tier pada tick terakhir
+        self.updates = 0  # Total update penjaga
+        self.skips = 0  # Total update yang dilewati
+
+    def begin_tick(self):
+        self.tier_counts = [0] * len(self.tiers)
+
+    def tier_of(self, guard, player):
+        distance = (abs(guard._x - player._x) + abs(guard._y - player._y)) / TILE_SIZE  # Jarak Manhattan dalam tile
+        for index, (limit, _) in enumerate(self.tiers):
+            if limit is None or distance <= limit:
+                return index
+        return len(self.tiers) - 1
+
+    def due_ticks(self, index, guard, player, tick):
+        # Jumlah tick yang harus dikejar penjaga pada tick ini, atau 0 jika belum gilirannya
+        tier = self.tier_of(guard, player)
+        self.tier_counts[tier] += 1
+        interval = self.tiers[tier][1]
+        if (tick + index) % interval:  # Fase digeser per penjaga agar beban tersebar
+            self.skips += 1
+            return 0
+        elapsed = tick - guard.last_ai_tick
+        guard.last_ai_tick = tick
+        self.updates += 1
+        return elapsed
+
 # Kelas untuk game
 class Game:
-    def __init__(self):
-        self.maze = Maze()  # Membuat objek labirin
-        self.player = Player(0 * TILE_SIZE, 7 * TILE_SIZE, 5)  # Membuat objek pemain
+    def __init__(self, headless=False, game_clock=None):
+        if not headless:
+            init()  # Membuka layar game jika belum
+        self.headless = headless  # Tanpa layar (untuk replay dan simulasi)
+        if game_clock is None:  # Simulasi tanpa layar memakai waktu tick yang deterministik
+            game_clock = SimulatedClock() if headless else RealTimeClock()
+        self.game_clock = game_clock  # Jam game bersama untuk semua entitas
+        if 'player' in self.__dict__:  # Dipanggil ulang oleh "Back to Main Menu": karakter lama kembali ke pool
+            self.release_characters()
+        if 'maze' in self.__dict__ and not self.maze.layout_version:  # Labirin yang tidak berubah dipakai ulang beserta cache jalurnya
+            self.maze.reset_stars()
+            self.maze.path_queue.clear()
+        else:
+            self.maze = Maze()  # Membuat objek labirin
+            self.maze.pathfinder = choose_pathfinder(self.maze)  # Inkremental untuk labirin kecil, hierarkis untuk yang sangat besar
+            self.maze.path_queue = PathRequestQueue(self.maze.pathfinder)  # Waktu pencarian jalur dibatasi per tick
+        self.player = player_pool.acquire(PLAYER_START[0] * TILE_SIZE, PLAYER_START[1] * TILE_SIZE, PLAYER_SPEED, self.game_clock)  # Objek pemain dari pool
         self.guards = []  # Daftar penjaga
         self.current_difficulty = None  # Menyimpan kesulitan saat ini, tidak diinisialisasi
+        self.seed = None  # Seed RNG ronde saat ini
+        self.rng = random.Random()  # RNG permainan, di-seed ulang setiap ronde
+        self.tick_count = 0  # Jumlah tick logika pada ronde saat ini
+        self.guard_setups = GUARD_SETUPS  # Posisi awal penjaga per kesulitan (bisa diganti untuk tuning)
+        self.guard_speed = GUARD_SPEED  # Kecepatan penjaga (bisa diganti untuk tuning)
+        self.ai_scheduler = AIScheduler()  # Frekuensi update penjaga berdasarkan jarak ke pemain
+        self.turbo_level = 0  # Indeks di TURBO_LEVELS (0 = kecepatan normal)
+        self.tick_meter = TickRateMeter()  # Tick per detik yang benar-benar tercapai
+        self.frame_meter = TickRateMeter()  # Frame yang digambar per detik (FPS di HUD)
+        self.round_start = None  # Snapshot awal ronde saat ini
+        self.attempt = 0  # Percobaan ke berapa pada level ini (Retry menambah satu)
+        self.catches = 0  # Berapa kali pemain tertangkap pada level ini
 
     def main_menu(self):
+        trace_scene('main_menu')
         # Membuat tombol untuk memulai dan keluar dari game
         start_button = Button(WIDTH // 2 - 100, HEIGHT // 2 - 30, 200, 50, "Start Game", BUTTON_COLOR, BUTTON_TEXT_COLOR)
         quit_button = Button(WIDTH // 2 - 100, HEIGHT // 2 + 40, 200, 50, "Quit Game", BUTTON_COLOR, BUTTON_TEXT_COLOR)
 
+        buttons = [start_button, quit_button]
+
         running = True
+        redraw = True  # Menu hanya digambar ulang jika ada perubahan
         while running:
-            screen.fill(BLACK)  # Mengisi layar dengan warna hitam
+            if redraw:
+                screen.fill(BLACK)  # Mengisi layar dengan warna hitam
 
-            # Menggambar judul game
-            title_text = title_font.render("MAZE RUNNER ARCADE", True, YELLOW)
-            title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 4))
-            screen.blit(title_text, title_rect)
+                # Menggambar judul game
+                title_text = text_cache.render(get_font(TITLE_FONT_SIZE), "MAZE RUNNER ARCADE", YELLOW)
+                title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 4))
+                screen.blit(title_text, title_rect)
 
-            start_button.draw()  # Menggambar tombol mulai
-            quit_button.draw()  # Menggambar tombol keluar
+                start_button.draw()  # Menggambar tombol mulai
+                quit_button.draw()  # Menggambar tombol keluar
 
-            for event in pygame.event.get():
+                present()  # Memperbarui tampilan layar
+                redraw = False
+
+                if STARTUP_PROBE:  # Mode pengukuran waktu startup
+                    print("first-frame", flush=True)
+                    pygame.quit()
+                    sys.exit()
+
+            for event in wait_menu_events():
                 if event.type == pygame.QUIT:
                     pygame.quit()  # Menutup game
                     sys.exit()     
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if start_button.is_clicked(event.pos):
                         self.difficulty_menu()  # Menampilkan menu kesulitan
+                        redraw = True  # Layar tertimpa oleh menu lain
                     elif quit_button.is_clicked(event.pos):
                         pygame.quit()  # Menutup game
                         sys.exit()    
-
-            pygame.display.flip()  # Memperbarui tampilan layar
-            clock.tick(60)  # Mengatur frame rate
+                elif needs_menu_redraw(event, buttons):
+                    redraw = True
 
     def finish_menu(self):
-        finish_text = title_font.render("Congratulations!", True, YELLOW)  # Teks kemenangan
+        trace_scene('finish_menu')
+        finish_text = text_cache.render(get_font(TITLE_FONT_SIZE), "Congratulations!", YELLOW)  # Teks kemenangan
         finish_rect = finish_text.get_rect(center=(WIDTH // 2, HEIGHT // 4))
 
         back_button_text = "Back to Main Menu"
-        back_button_surface = button_font.render(back_button_text, True, BUTTON_TEXT_COLOR)  # Membuat surface untuk tombol kembali
+        back_button_surface = text_cache.render(get_font(BUTTON_FONT_SIZE), back_button_text, BUTTON_TEXT_COLOR)  # Membuat surface untuk tombol kembali
         back_button_width = back_button_surface.get_width() + 20  # Lebar tombol kembali
         back_button_height = back_button_surface.get_height() + 10  # Tinggi tombol kembali
         back_button = Button(WIDTH // 2 - back_button_width // 2, HEIGHT // 2 + 40, back_button_width, back_button_height, back_button_text, BUTTON_COLOR, BUTTON_TEXT_COLOR)  # Membuat tombol kembali
@@ -374,19 +1443,26 @@ class Game:
         elif self.current_difficulty == "medium":
             next_level_button = Button(WIDTH // 2 - 100, 270, 200, 50, "Next Level", BUTTON_COLOR, BUTTON_TEXT_COLOR)  # Tombol Next Level untuk Medium
 
+        buttons = [next_level_button, back_button, quit_button]
+
         running = True
+        redraw = True  # Menu hanya digambar ulang jika ada perubahan
         while running:
-            screen.fill(BLACK)  # Mengisi layar dengan warna hitam
+            if redraw:
+                screen.fill(BLACK)  # Mengisi layar dengan warna hitam
 
-            screen.blit(finish_text, finish_rect)  # Menggambar teks kemenangan
+                screen.blit(finish_text, finish_rect)  # Menggambar teks kemenangan
 
-            if next_level_button:  # Jika tombol Next Level ada, gambar tombol tersebut
-                next_level_button.draw()
+                if next_level_button:  # Jika tombol Next Level ada, gambar tombol tersebut
+                    next_level_button.draw()
 
-            back_button.draw()  # Menggambar tombol kembali
-            quit_button.draw()  # Menggambar tombol keluar
+                back_button.draw()  # Menggambar tombol kembali
+                quit_button.draw()  # Menggambar tombol keluar
 
-            for event in pygame.event.get():
+                present()  # Memperbarui tampilan layar
+                redraw = False
+
+            for event in wait_menu_events():
                 if event.type == pygame.QUIT:
                     pygame.quit()  # Menutup game
                     sys.exit()     
@@ -402,82 +1478,312 @@ class Game:
                             self.start_game("medium")  # Melanjutkan ke level Medium
                         elif self.current_difficulty == "medium":
                             self.start_game("hard")  # Melanjutkan ke level Hard
-
-            pygame.display.flip()  # Memperbarui tampilan layar
-            clock.tick(60)  # Mengatur frame rate
+                    redraw = True  # Layar mungkin tertimpa oleh layar lain
+                elif needs_menu_redraw(event, buttons):
+                    redraw = True
 
     def start_game(self, difficulty):
-        self.current_difficulty = difficulty  # Simpan kesulitan yang dipilih
         print(f" Starting game on {difficulty} difficulty...")  # Menampilkan tingkat kesulitan
+        trace_scene(f'game_{difficulty}')
+        self.attempt = 1
+        self.catches = 0
+        self.new_round(difficulty)  # Menyiapkan ronde baru
+        self.play_game()  # Memulai permainan
+
+    def new_round(self, difficulty, seed=None):
+        self.current_difficulty = difficulty  # Simpan kesulitan yang dipilih
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)  # Seed baru jika tidak diberikan
+        self.rng.seed(self.seed)
+        self.tick_count = 0
+        self.game_clock.reset()  # Waktu ronde dimulai dari awal
         self.maze.reset_stars()  # Reset status bintang
-        self.player = Player(0 * TILE_SIZE, 7 * TILE_SIZE, 5)  # Membuat objek pemain
-        self.guards = []  # Mengosongkan daftar penjaga
+        self.maze.path_queue.clear()  # Permintaan jalur penjaga lama dibuang
+        if isinstance(self.maze.pathfinder, NextHopPathfinder):
+            self.maze.pathfinder.build()  # Tabel dibangun saat level dimuat, bukan di tengah ronde
+        self.release_characters()  # Pemain dan penjaga ronde lama kembali ke pool
+        self.player = player_pool.acquire(PLAYER_START[0] * TILE_SIZE, PLAYER_START[1] * TILE_SIZE, PLAYER_SPEED, self.game_clock)  # Objek pemain dari pool
         self.initialize_guards(difficulty)  # Menginisialisasi penjaga berdasarkan kesulitan
-        self.play_game()  # Memulai permainan
+        self.round_start = self.snapshot()  # Untuk Retry tanpa membuat ulang objek
+
+    def retry(self):
+        print(f" Retrying {self.current_difficulty} difficulty...")
+        trace_scene(f'game_{self.current_difficulty}')
+        self.restore(self.round_start)  # Status awal ronde dipulihkan di tempat
+        self.attempt += 1
+        self.play_game()
     
     def initialize_guards(self, difficulty):
         # Menambahkan penjaga berdasarkan tingkat kesulitan
-        if difficulty == "easy":
-            self.guards.append(Guard(1 * TILE_SIZE, 1 * TILE_SIZE, 2))  # Satu penjaga untuk kesulitan mudah
-        elif difficulty == "medium":
-            self.guards.append(Guard(1 * TILE_SIZE, 1 * TILE_SIZE, 2))  # Dua penjaga untuk kesulitan sedang
-            self.guards.append(Guard(18 * TILE_SIZE, 1 * TILE_SIZE, 2))
-        elif difficulty == "hard":
-            self.guards.append(Guard(1 * TILE_SIZE, 1 * TILE_SIZE, 2))  # Tiga penjaga untuk kesulitan sulit
-            self.guards.append(Guard(18 * TILE_SIZE, 1 * TILE_SIZE, 2))  
-            self.guards.append(Guard(1 * TILE_SIZE, 13 * TILE_SIZE, 2))  
+        for tile_x, tile_y in self.guard_setups.get(difficulty, []):
+            self.guards.append(guard_pool.acquire(tile_x * TILE_SIZE, tile_y * TILE_SIZE, self.guard_speed, self.game_clock))
+
+    def release_characters(self):
+        player_pool.release(self.player)
+        for guard in self.guards:
+            guard_pool.release(guard)
+        self.guards.clear()
+
+    def tick(self, keys):
+        # Satu langkah logika game; mengembalikan OUTCOME_CAUGHT, OUTCOME_FINISHED atau None
+        self.tick_count += 1
+        self.game_clock.advance()  # Jam dimajukan sekali untuk semua entitas
+        self.ai_scheduler.begin_tick()
+        self.maze.path_queue.begin_tick()  # Melanjutkan pencarian jalur yang tertunda dengan anggaran baru
+        for index, guard in enumerate(self.guards):
+            ticks = self.ai_scheduler.due_ticks(index, guard, self.player, self.tick_count)
+            if ticks and guard.move(self.player, self.maze, ticks):  # Menggerakkan penjaga
+                return OUTCOME_CAUGHT
+
+        if self.player.move(keys, self.maze):  # Menggerakkan pemain
+            return OUTCOME_FINISHED
+
+        for guard in self.guards:
+            if (self.player._x, self.player._y) == (guard._x, guard._y):  # Memeriksa apakah pemain tertangkap
+                return OUTCOME_CAUGHT
+        return None
+
+    def state_hash(self):
+        # Hash status game untuk memeriksa replay setiap tick
+        values = [self.tick_count, self.player._x, self.player._y]
+        for guard in self.guards:
+            values += [guard._x, guard._y]
+        stars = sum(1 << index for index, collected in enumerate(self.maze._stars_collected) if collected)
+        return zlib.crc32(struct.pack(f'<I{len(values)}d', stars, *values))
+
+    def snapshot(self):
+        # Seluruh status ronde dalam blob biner kecil (224 byte untuk kesulitan hard)
+        stars = sum(1 << index for index, collected in enumerate(self.maze._stars_collected) if collected)
+        player = self.player
+        blob = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, DIFFICULTIES.index(self.current_difficulty),
+                                    len(self.guards), self.seed, self.tick_count, self.game_clock.now, stars)
+        facing_left = any(player.current_image is image for image in player.player_images_left)
+        blob += PLAYER_RECORD.pack(player._x, player._y, player.frame_index, facing_left, player.last_update_time)
+        for guard in self.guards:
+            heading = guard.heading or (0, 0)
+            target = guard.target or (0.0, 0.0)
+            last_seen = guard.last_seen or (-1, -1)
+            blob += GUARD_RECORD.pack(guard._x, guard._y, guard.frame_index, guard.direction == 'left',
+                                      guard.last_update_time, guard.last_ai_tick, heading[0], heading[1],
+                                      guard.target is not None, guard.state, target[0], target[1],
+                                      guard.patrol_index, guard.home[0], guard.home[1], last_seen[0], last_seen[1])
+        return blob
+
+    def restore(self, blob):
+        # Mengembalikan status dari snapshot() tanpa membuat ulang pemain, penjaga atau gambarnya.
+        # Seluruh blob dibaca dan diperiksa ke variabel lokal dulu; status hanya diubah jika semuanya valid.
+        if len(blob) < SNAPSHOT_HEADER.size:
+            raise ValueError("Truncated game snapshot")
+        magic, version, difficulty, guard_count, seed, tick_count, now, stars = SNAPSHOT_HEADER.unpack_from(blob)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported game snapshot")
+        if difficulty >= len(DIFFICULTIES) or len(blob) != SNAPSHOT_HEADER.size + PLAYER_RECORD.size + guard_count * GUARD_RECORD.size:
+            raise ValueError("Corrupt game snapshot")
+
+        layout = self.maze._layout
+        def open_tile(x, y):
+            return 0 <= x < len(layout[0]) and 0 <= y < len(layout) and layout[y][x] == 0
+
+        player_record = PLAYER_RECORD.unpack_from(blob, SNAPSHOT_HEADER.size)
+        if player_record[2] >= ANIMATION_FRAMES:
+            raise ValueError("Corrupt game snapshot: player animation frame")
+        guard_records = [GUARD_RECORD.unpack_from(blob, SNAPSHOT_HEADER.size + PLAYER_RECORD.size + index * GUARD_RECORD.size)
+                         for index in range(guard_count)]
+        for record in guard_records:
+            frame_index, state, patrol_index = record[2], record[9], record[12]
+            home, last_seen = record[13:15], record[15:17]
+            if frame_index >= ANIMATION_FRAMES or state not in (GUARD_PATROL, GUARD_CHASE, GUARD_SEARCH) or \
+                    not open_tile(*home) or patrol_index >= len(self.maze.patrol_route(home)) or \
+                    (last_seen != (-1, -1) and not open_tile(*last_seen)):
+                raise ValueError("Corrupt game snapshot: guard record")
+
+        self.current_difficulty = DIFFICULTIES[difficulty]
+        self.seed = seed
+        self.rng.seed(seed)  # Tidak ada yang mengambil angka dari RNG selama ronde, jadi seed sudah cukup
+        self.tick_count = tick_count
+        self.game_clock.now = now
+        self.maze._stars_collected[:] = [bool(stars >> index & 1) for index in range(len(self.maze._star_positions))]
+        self.maze.path_queue.clear()  # Pencarian yang tertunda diminta ulang dari posisi yang dipulihkan
+
+        player = self.player
+        player._x, player._y, player.frame_index, facing_left, player.last_update_time = player_record
+        player.current_image = (player.player_images_left if facing_left else player.player_images)[player.frame_index]
+
+        while len(self.guards) < guard_count:  # Penjaga baru hanya dibuat jika jumlahnya bertambah
+            self.guards.append(guard_pool.acquire(0, 0, self.guard_speed, self.game_clock))
+        while len(self.guards) > guard_count:
+            guard_pool.release(self.guards.pop())
+        for guard, record in zip(self.guards, guard_records):
+            (guard._x, guard._y, guard.frame_index, facing_left, guard.last_update_time, guard.last_ai_tick,
+             heading_x, heading_y, has_target, guard.state, target_x, target_y, guard.patrol_index,
+             home_x, home_y, seen_x, seen_y) = record
+            guard.direction = 'left' if facing_left else 'right'
+            guard.current_image = (guard.guard_images_left if facing_left else guard.guard_images)[guard.frame_index]
+            guard.heading = (heading_x, heading_y) if heading_x or heading_y else None
+            guard.target = (target_x, target_y) if has_target else None
+            guard.home = (home_x, home_y)
+            guard.last_seen = (seen_x, seen_y) if seen_x >= 0 else None
+            guard.path.clear()  # Jalur diminta ulang di batas tile berikutnya
+
+    def draw(self):
+        screen.fill(BLACK)  # Mengisi layar dengan warna hitam
+        self.maze.draw()  # Menggambar labirin
+        self.player.draw()  # Menggambar pemain
+        for guard in self.guards:
+            guard.draw()  # Menggambar penjaga
+        if self.turbo_level:  # Kecepatan tick ditampilkan hanya saat mode turbo
+            ticks_per_frame = TURBO_LEVELS[self.turbo_level]
+            label = self.tick_meter.render("MAX" if ticks_per_frame is None else f"x{ticks_per_frame}")
+            render_queue.add(LAYER_OVERLAY, label, (HUD_MARGIN, HUD_MARGIN))
+        stars = self.maze._stars_collected
+        hud_surface = hud.render(self.tick_count, sum(stars), len(stars), self.frame_meter.rate)
+        render_queue.add(LAYER_OVERLAY, hud_surface, (WIDTH - hud_surface.get_width() - HUD_MARGIN, HUD_MARGIN))
+        render_queue.flush(screen)  # Mengirim semua perintah gambar dalam satu batch
 
     def play_game(self):
+        # Merekam input jika MAZE_RECORD_DIR diatur
+        record_dir = os.environ.get('MAZE_RECORD_DIR')
+        log = InputLog(self.current_difficulty, self.seed) if record_dir else None
+
+        rewind = RewindBuffer()  # Snapshot untuk mundur (Backspace)
+        # Telemetri ronde: hanya dikumpulkan di memori, diringkas dan ditulis oleh thread penulis
+        frame_histogram = FrameHistogram() if TELEMETRY_PATH else None  # Lama frame, ukuran tetap
+        star_seconds = [None] * len(self.maze._star_positions)  # Waktu game saat setiap bintang diambil
+        stars_seen = self.maze._stars_collected[:]
+        exit_locked = False  # Pesan garis finish terkunci hanya dilaporkan saat status berubah
+        rewinds = 0
+        round_start = frame_start = time.perf_counter()
+        outcome = None
         running = True
         while running:
-            screen.fill(BLACK)  # Mengisi layar dengan warna hitam
-
-            self.maze.draw()  # Menggambar labirin
-            self.player.draw()  # Menggambar pemain
-            for guard in self.guards:
-                guard.move(self.player, self.maze)  # Menggerakkan penjaga
-                guard.draw()  # Menggambar penjaga
-
+            if frame_histogram is not None:
+                now = time.perf_counter()
+                frame_histogram.add(now - frame_start)
+                frame_start = now
             keys = pygame.key.get_pressed()  # Mendapatkan input keyboard
-            self.player.move(keys, self.maze)  # Menggerakkan pemain
-
-            for guard in self.guards:
-                if (self.player._x, self.player._y) == (guard._x, guard._y):  # Memeriksa apakah pemain tertangkap
-                    self.lose_menu()  # Menampilkan menu kalah
+            ticks_per_frame = TURBO_LEVELS[self.turbo_level]
+            slice_end = time.perf_counter() + TURBO_SLICE
+            ticks = 0
+            while True:  # Beberapa tick logika per frame pada mode turbo, dengan input yang sama
+                rewind.record(self)  # Diambil sebelum tick agar selalu lebih awal dari sekarang
+                outcome = self.tick(keys)  # Menjalankan logika game
+                ticks += 1
+                if self.maze._stars_collected != stars_seen:  # Bintang baru diambil pada tick ini
+                    for index, collected in enumerate(self.maze._stars_collected):
+                        if collected and not stars_seen[index]:
+                            star_seconds[index] = round(self.tick_count / TICKS_PER_SECOND, 3)
+                    stars_seen = self.maze._stars_collected[:]
+                if self.player.exit_locked != exit_locked:
+                    exit_locked = self.player.exit_locked
+                    if exit_locked:
+                        record_telemetry({'event': 'exit_locked', 'difficulty': self.current_difficulty, 'seed': self.seed,
+                                          'attempt': self.attempt, 'ticks': self.tick_count,
+                                          'stars': sum(self.maze._stars_collected)})
+                if log is not None:
+                    log.record(keys, self.state_hash())
+                if outcome is not None:
+                    break
+                if ticks_per_frame is None:
+                    if ticks % 32 == 0 and time.perf_counter() >= slice_end:
+                        break  # Mode tanpa batas: sesekali kembali untuk event dan layar
+                elif ticks >= ticks_per_frame:
+                    break
+            self.tick_meter.count(ticks)
+            if outcome is not None:
+                break  # Ronde selesai
+
+            self.draw()  # Menggambar game
+            self.frame_meter.count(1)
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False  # Menghentikan permainan jika jendela ditutup
-
-            pygame.display.flip()  # Memperbarui tampilan layar
-            clock.tick(60)  # Mengatur frame rate
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                    self.turbo_level = (self.turbo_level + 1) % len(TURBO_LEVELS)  # Mengganti kecepatan turbo
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE and rewind:
+                    rewind.rewind(self)  # Mundur ke snapshot sebelumnya
+                    stars_seen = self.maze._stars_collected[:]
+                    rewinds += 1
+                    if log is not None:  # Rekaman dipotong agar tetap bisa diputar ulang
+                        del log.inputs[self.tick_count:]
+                        del log.hashes[self.tick_count:]
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                    try:
+                        with open(SAVE_PATH, 'wb') as save_file:
+                            save_file.write(self.snapshot())  # Simpan cepat
+                    except OSError as error:
+                        print(f" Quick save failed: {error}")  # Ronde tetap berjalan
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and os.path.exists(SAVE_PATH):
+                    try:
+                        with open(SAVE_PATH, 'rb') as save_file:
+                            self.restore(save_file.read())  # Muat cepat
+                    except (ValueError, struct.error, OSError) as error:
+                        print(f" Quick load ignored: {error}")  # File rusak atau versi lama diabaikan
+                        continue
+                    stars_seen = self.maze._stars_collected[:]
+                    rewind.clear()
+                    log = None  # Ronde yang dimuat tidak bisa diputar ulang dari seed, rekaman dihentikan
+
+            present()  # Memperbarui tampilan layar
+            if ticks_per_frame is not None:
+                clock.tick(TICKS_PER_SECOND)  # Mengatur frame rate
+
+        if log is not None:
+            log.outcome = outcome
+            log.save(os.path.join(record_dir, f"{int(time.time())}-{self.current_difficulty}-{self.seed}.mzr"))
+
+        if outcome == OUTCOME_CAUGHT:
+            print("Player caught by the guard!")  # Pesan sekali per ronde, setelah loop game
+            self.catches += 1
+        elif outcome == OUTCOME_FINISHED:
+            print("Selamat! Anda telah mencapai garis finish!")  # Pesan kemenangan
+        record_telemetry({
+            'event': 'round', 'difficulty': self.current_difficulty, 'seed': self.seed, 'attempt': self.attempt,
+            'outcome': outcome or 'quit', 'ticks': self.tick_count,
+            'seconds': round(self.tick_count / TICKS_PER_SECOND, 3),  # Waktu game, tidak terpengaruh turbo
+            'wall_seconds': round(time.perf_counter() - round_start, 3),
+            'stars': sum(self.maze._stars_collected), 'star_seconds': star_seconds,
+            'catches': self.catches, 'rewinds': rewinds, 'frame_histogram': frame_histogram,
+        })
+
+        if outcome == OUTCOME_CAUGHT:
+            self.lose_menu()  # Menampilkan menu kalah
+        elif outcome == OUTCOME_FINISHED:
+            self.finish_menu()  # Menampilkan menu akhir
 
     def lose_menu(self):
-        lose_text = title_font.render("You Lose!", True, YELLOW)  # Teks kalah
+        trace_scene('lose_menu')
+        lose_text = text_cache.render(get_font(TITLE_FONT_SIZE), "You Lose!", YELLOW)  # Teks kalah
         lose_rect = lose_text.get_rect(center=(WIDTH // 2, HEIGHT // 4))
         
         back_button_text = "Back to Main Menu" # Teks untuk tombol Kembali ke Main Menu
-        back_button_surface = button_font.render(back_button_text , True, BUTTON_TEXT_COLOR)  # Membuat surface untuk tombol kembali
+        back_button_surface = text_cache.render(get_font(BUTTON_FONT_SIZE), back_button_text, BUTTON_TEXT_COLOR)  # Membuat surface untuk tombol kembali
         back_button_width = back_button_surface.get_width() + 20  # Lebar tombol kembali
         back_button_height = back_button_surface.get_height() + 10  # Tinggi tombol kembali
         back_button = Button(WIDTH // 2 - back_button_width // 2, HEIGHT // 2 + 40, back_button_width, back_button_height, back_button_text, BUTTON_COLOR, BUTTON_TEXT_COLOR)  # Membuat tombol kembali
 
         retry_button_text = "Retry"  # Teks untuk tombol Retry
-        retry_button_surface = button_font.render(retry_button_text, True, BUTTON_TEXT_COLOR)  # Membuat surface untuk tombol Retry
+        retry_button_surface = text_cache.render(get_font(BUTTON_FONT_SIZE), retry_button_text, BUTTON_TEXT_COLOR)  # Membuat surface untuk tombol Retry
         retry_button_width = retry_button_surface.get_width() + 20  # Lebar tombol Retry
         retry_button_height = retry_button_surface.get_height() + 10  # Tinggi tombol Retry
         retry_button = Button(WIDTH // 2 - retry_button_width // 2, HEIGHT // 2 - 30, retry_button_width, retry_button_height, retry_button_text, BUTTON_COLOR, BUTTON_TEXT_COLOR)  # Membuat tombol Retry
 
+        buttons = [retry_button, back_button]
+
         running = True
+        redraw = True  # Menu hanya digambar ulang jika ada perubahan
         while running:
-            screen.fill(BLACK)  # Mengisi layar dengan warna hitam
+            if redraw:
+                screen.fill(BLACK)  # Mengisi layar dengan warna hitam
 
-            screen.blit(lose_text, lose_rect)  # Menggambar teks kalah
+                screen.blit(lose_text, lose_rect)  # Menggambar teks kalah
 
-            retry_button.draw()  # Menggambar tombol Retry
-            back_button.draw()  # Menggambar tombol kembali
+                retry_button.draw()  # Menggambar tombol Retry
+                back_button.draw()  # Menggambar tombol kembali
 
-            for event in pygame.event.get():
+                present()  # Memperbarui tampilan layar
+                redraw = False
+
+            for event in wait_menu_events():
                 if event.type == pygame.QUIT:
                     pygame.quit()  # Menutup game
                     sys.exit()    
@@ -486,33 +1792,41 @@ class Game:
                         self.__init__()  # Menginisialisasi ulang game
                         self.main_menu()  # Kembali ke menu utama
                     elif retry_button.is_clicked(event.pos):
-                        if self.current_difficulty:  # Pastikan kesulitan sudah dipilih
-                            self.start_game(self.current_difficulty)  # Mengulang permainan dengan kesulitan yang sama
-
-            pygame.display.flip()  # Memperbarui tampilan layar
-            clock.tick(60)  # Mengatur frame rate
+                        if self.round_start is not None:  # Pastikan sudah ada ronde yang dimainkan
+                            self.retry()  # Mengulang ronde dari snapshot awalnya
+                    redraw = True  # Layar mungkin tertimpa oleh layar lain
+                elif needs_menu_redraw(event, buttons):
+                    redraw = True
 
     def difficulty_menu(self):
+        trace_scene('difficulty_menu')
         # Membuat tombol untuk memilih tingkat kesulitan
         easy_button = Button(WIDTH // 2 - 100, HEIGHT // 2 - 30, 200, 50, "Easy", GREEN, BUTTON_TEXT_COLOR)
         medium_button = Button(WIDTH // 2 - 100, HEIGHT // 2 + 40, 200, 50, "Medium", (255, 165, 0), BUTTON_TEXT_COLOR)
         hard_button = Button(WIDTH // 2 - 100, HEIGHT // 2 + 110, 200, 50, "Hard", (255, 0, 0), BUTTON_TEXT_COLOR)
         back_button = Button(WIDTH // 2 - 100, HEIGHT // 2 + 180, 200, 50, "Back", BUTTON_COLOR, BUTTON_TEXT_COLOR)
 
+        buttons = [easy_button, medium_button, hard_button, back_button]
+
         running = True
+        redraw = True  # Menu hanya digambar ulang jika ada perubahan
         while running:
-            screen.fill(BLACK)  # Mengisi layar dengan warna hitam
+            if redraw:
+                screen.fill(BLACK)  # Mengisi layar dengan warna hitam
 
-            difficulty_text = title_font.render("Select Difficulty", True, YELLOW)  # Teks untuk memilih kesulitan
-            difficulty_rect = difficulty_text.get_rect(center=(WIDTH // 2, HEIGHT // 4))
-            screen.blit(difficulty_text, difficulty_rect)  # Menggambar teks kesulitan
+                difficulty_text = text_cache.render(get_font(TITLE_FONT_SIZE), "Select Difficulty", YELLOW)  # Teks untuk memilih kesulitan
+                difficulty_rect = difficulty_text.get_rect(center=(WIDTH // 2, HEIGHT // 4))
+                screen.blit(difficulty_text, difficulty_rect)  # Menggambar teks kesulitan
 
-            easy_button.draw()  # Menggambar tombol mudah
-            medium_button.draw()  # Menggambar tombol sedang
-            hard_button.draw()  # Menggambar tombol sulit
-            back_button.draw()  # Menggambar tombol kembali
+                easy_button.draw()  # Menggambar tombol mudah
+                medium_button.draw()  # Menggambar tombol sedang
+                hard_button.draw()  # Menggambar tombol sulit
+                back_button.draw()  # Menggambar tombol kembali
 
-            for event in pygame.event.get():
+                present()  # Memperbarui tampilan layar
+                redraw = False
+
+            for event in wait_menu_events():
                 if event.type == pygame.QUIT:
                     running = False  # Menghentikan permainan jika jendela ditutup
                 if event.type == pygame.MOUSEBUTTONDOWN:
@@ -524,9 +1838,9 @@ class Game:
                         self.start_game("hard")  # Memulai permainan dengan kesulitan sulit
                     elif back_button.is_clicked(event.pos):
                         return  # Kembali ke menu sebelumnya
-
-            pygame.display.flip()  # Memperbarui tampilan layar
-            clock.tick(60)  # Mengatur frame rate
+                    redraw = True  # Layar mungkin tertimpa oleh permainan
+                elif needs_menu_redraw(event, buttons):
+                    redraw = True
 
     def run(self):
         self.main_menu()  # Memulai game dengan menu utama
@@ -0,0 +1,149 @@
+import argparse  # Mengimpor argparse untuk argumen baris perintah
+import collections  # Mengimpor collections untuk menghitung lokasi tertangkap
+import itertools  # Mengimpor itertools untuk kombinasi konfigurasi
+import json  # Mengimpor json untuk laporan
+import multiprocessing  # Mengimpor multiprocessing untuk process pool
+import os  # Mengimpor modul os untuk jumlah CPU
+import random  # Mengimpor random untuk RNG bot
+import statistics  # Mengimpor statistics untuk ringkasan waktu
+import time  # Mengimpor modul time untuk mengukur durasi
+
+import baru  # Mengimpor game
+
+TICKS_PER_SECOND = 60  # Tick logika per detik pada game asli
+EXIT_TILE = (19, 7)  # Tile garis finish
+DIRECTION_BITS = {(0, -1): 1, (0, 1): 2, (-1, 0): 4, (1, 0): 8}  # Arah tile ke bitmask input
+
+# Bot yang berjalan ke bintang terdekat lalu ke garis finish sambil menghindari tile penjaga
+class GreedyBot:
+    def __init__(self, rng, epsilon=0.1):
+        self.rng = rng  # RNG per game agar hasil bervariasi tapi bisa diulang
+        self.epsilon = epsilon  # Peluang memilih arah acak di persimpangan
+        self.bits = 0  # Input yang sedang ditahan
+
+    def __call__(self, game):
+        player = game.player
+        tile_size = baru.TILE_SIZE
+        if player._x % tile_size or player._y % tile_size:
+            return self.bits  # Tetap di arah yang sama sampai tepat di tengah tile
+
+        tile = (player._x // tile_size, player._y // tile_size)
+        layout = game.maze._layout
+        stars = [(x // tile_size, y // tile_size) for (x, y), collected
+                 in zip(game.maze._star_positions, game.maze._stars_collected) if not collected]
+        target = min(stars, key=lambda star: abs(star[0] - tile[0]) + abs(star[1] - tile[1])) if stars else EXIT_TILE
+
+        # Tile penjaga dianggap dinding agar bot mencari jalan memutar
+        blocked = [row[:] for row in layout]
+        for guard in game.guards:
+            guard_tile = (int(guard._x) // tile_size, int(guard._y) // tile_size)
+            if guard_tile != tile and guard_tile != target:
+                blocked[guard_tile[1]][guard_tile[0]] = 1
+        path = baru.Guard.bfs(blocked, tile, target)
+
+        if len(path) > 1 and self.rng.random() >= self.epsilon:
+            step = (path[1][0] - tile[0], path[1][1] - tile[1])
+        else:
+            options = [direction for direction in DIRECTION_BITS
+                       if 0 <= tile[0] + direction[0] < len(layout[0]) and 0 <= tile[1] + direction[1] < len(layout)
+                       and layout[tile[1] + direction[1]][tile[0] + direction[0]] == 0]
+            step = self.rng.choice(options) if options else (0, 0)
+        self.bits = DIRECTION_BITS.get(step, 0)
+        return self.bits
+
+# Bot yang menahan arah acak selama beberapa tick
+class RandomBot:
+    def __init__(self, rng):
+        self.rng = rng
+        self.bits = 0
+        self.hold = 0  # Sisa tick untuk arah saat ini
+
+    def __call__(self, game):
+        if self.hold <= 0:
+            self.bits = self.rng.choice(list(DIRECTION_BITS.values()))
+            self.hold = self.rng.randint(8, 40)
+        self.hold -= 1
+        return self.bits
+
+POLICIES = {'greedy': GreedyBot, 'random': RandomBot}
+
+def run_game(task):
+    # Menjalankan satu game tanpa layar; mengembalikan (indeks konfigurasi, hasil, tick, tile tertangkap)
+    config_index, config, seed = task
+    game = baru.Game(headless=True)
+    game.guard_speed = config['guard_speed']
+    if config['guards'] is not None:
+        game.guard_setups = {config['difficulty']: config['guards']}
+    game.new_round(config['difficulty'], seed)
+    policy = POLICIES[config['policy']](random.Random(seed))
+
+    outcome = None
+    while outcome is None and game.tick_count < config['max_ticks']:
+        outcome = game.tick(baru.decode_keys(policy(game)))
+    catch_tile = None
+    if outcome == baru.OUTCOME_CAUGHT:
+        catch_tile = (game.player._x // baru.TILE_SIZE, game.player._y // baru.TILE_SIZE)
+    return config_index, outcome, game.tick_count, catch_tile
+
+def summarize(config, results):
+    # Merangkum hasil satu konfigurasi
+    games = len(results)
+    wins = [ticks for outcome, ticks, _ in results if outcome == baru.OUTCOME_FINISHED]
+    catches = collections.Counter(tile for outcome, _, tile in results if outcome == baru.OUTCOME_CAUGHT)
+    finish_seconds = sorted(ticks / TICKS_PER_SECOND for ticks in wins)
+    return {
+        'config': config,
+        'games': games,
+        'win_rate': len(wins) / games,
+        'caught_rate': sum(catches.values()) / games,
+        'timeout_rate': (games - len(wins) - sum(catches.values())) / games,
+        'finish_seconds_median': statistics.median(finish_seconds) if finish_seconds else None,
+        'finish_seconds_p90': finish_seconds[int(0.9 * (len(finish_seconds) - 1))] if finish_seconds else None,
+        'top_catch_tiles': [[list(tile), count] for tile, count in catches.most_common(5)],
+    }
+
+def parse_guards(text):
+    # "1,1;18,1" -> [(1, 1), (18, 1)]
+    return [tuple(int(value) for value in pair.split(',')) for pair in text.split(';')]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless Maze Runner games in parallel and report difficulty statistics.")
+    parser.add_argument('--difficulty', nargs='+', choices=baru.DIFFICULTIES, default=list(baru.DIFFICULTIES))
+    parser.add_argument('--guard-speed', nargs='+', type=int, default=[baru.GUARD_SPEED], help="one or more guard speeds to compare")
+    parser.add_argument('--guards', type=parse_guards, default=None, help='override guard start tiles, e.g. "1,1;18,1"')
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--games', type=int, default=1000, help="games per configuration")
+    parser.add_argument('--max-ticks', type=int, default=60 * TICKS_PER_SECOND, help="ticks before a game counts as a timeout")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    configs = [{'difficulty': difficulty, 'guard_speed': speed, 'guards': args.guards,
+                'policy': args.policy, 'max_ticks': args.max_ticks}
+               for difficulty, speed in itertools.product(args.difficulty, args.guard_speed)]
+    tasks = [(index, config, args.seed + game_index)
+             for index, config in enumerate(configs) for game_index in range(args.games)]
+
+    start = time.perf_counter()
+    results = collections.defaultdict(list)
+    with multiprocessing.Pool(args.workers) as pool:
+        for config_index, outcome, ticks, catch_tile in pool.imap_unordered(run_game, tasks, chunksize=16):
+            results[config_index].append((outcome, ticks, catch_tile))
+    elapsed = time.perf_counter() - start
+
+    report = [summarize(config, results[index]) for index, config in enumerate(configs)]
+    for entry in report:
+        config = entry['config']
+        median = entry['finish_seconds_median']
+        print(f"{config['difficulty']:>6} speed {config['guard_speed']}: win {entry['win_rate']:6.1%}  "
+              f"caught {entry['caught_rate']:6.1%}  timeout {entry['timeout_rate']:6.1%}  "
+              f"finish median {'-' if median is None else f'{median:.1f}s'}  "
+              f"catch tiles {entry['top_catch_tiles']}")
+    print(f"{len(tasks)} games in {elapsed:.1f} s with {args.workers} workers")
+    if args.json:
+        with open(args.json, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+
+if __name__ == "__main__":
+    main()
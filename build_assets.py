@@ -0,0 +1,42 @@
+import argparse  # Mengimpor argparse untuk argumen baris perintah
+import os  # Mengimpor modul os untuk variabel lingkungan
+import struct  # Mengimpor struct untuk mengenali paket yang rusak
+import sys  # Mengimpor modul sys untuk kode keluar
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Tidak perlu layar untuk membuat paket
+
+import baru  # Mengimpor definisi sprite dan format paket dari game
+
+# Membuat sprites.pack: semua sprite diskalakan sekali untuk setiap ukuran tile yang didukung
+def build(path=baru.SPRITE_PACK_PATH):
+    sprites = {}
+    for tile_size in baru.SPRITE_TILE_SIZES:
+        for name, surface in baru.load_source_sprites(tile_size).items():
+            sprites[(tile_size, name)] = surface
+    fingerprints = {name: baru.source_fingerprint(source) for name, source in baru.SPRITE_SOURCES.items()}
+    baru.write_sprite_pack(path, sprites, fingerprints)
+    print(f"Wrote {len(sprites)} sprites for tile sizes {baru.SPRITE_TILE_SIZES} to {path} ({os.path.getsize(path)} bytes)")
+
+# Memeriksa isi (CRC32) semua gambar sumber terhadap paket; untuk CI
+def check(path=baru.SPRITE_PACK_PATH):
+    try:
+        with open(path, 'rb') as pack_file:
+            _, fingerprints = baru.read_sprite_pack_header(pack_file)
+    except (OSError, ValueError, struct.error) as error:
+        print(f"FAIL: {error}")
+        return 1
+    stale = baru.stale_sprite_sources(fingerprints, check_contents=True)
+    if stale:
+        print(f"FAIL: {path} is out of date for {', '.join(stale)}; run build_assets.py")
+        return 1
+    print(f"OK: {path} matches its {len(fingerprints)} source images")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the pre-scaled sprite pack, or check that it matches the source images.")
+    parser.add_argument('path', nargs='?', default=baru.SPRITE_PACK_PATH)
+    parser.add_argument('--check', action='store_true', help="exit non-zero if the pack is missing or out of date")
+    args = parser.parse_args()
+    if args.check:
+        sys.exit(check(args.path))
+    build(args.path)
@@ -0,0 +1,29 @@
+import subprocess  # Mengimpor subprocess untuk menjalankan python -X importtime
+import sys  # Mengimpor modul sys untuk interpreter python dan kode keluar
+
+IMPORT_BUDGET_MS = 50  # Batas waktu impor kumulatif modul baru (milidetik)
+HEAVY_MODULES = ('pygame',)  # Modul yang tidak boleh ikut diimpor oleh "import baru"
+
+# Menjalankan "import baru" dengan -X importtime lalu memeriksa biaya impornya
+def measure_import():
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import baru'], capture_output=True, text=True, check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')  # Format: "import time: self | cumulative | nama"
+        timings[name.strip()] = int(cumulative_us)
+    return timings
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else IMPORT_BUDGET_MS
+    timings = measure_import()
+    cost_ms = timings['baru'] / 1000
+    heavy = [name for name in timings if name.split('.')[0] in HEAVY_MODULES]
+    print(f"import baru: {cost_ms:.1f} ms (budget {budget:.0f} ms)")
+    if heavy:
+        print(f"FAIL: import baru pulled in {', '.join(sorted(heavy)[:5])}")
+        sys.exit(1)
+    if cost_ms > budget:
+        print("FAIL: import baru exceeded its budget")
+        sys.exit(1)
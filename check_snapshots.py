@@ -0,0 +1,85 @@
+import argparse  # Mengimpor argparse untuk argumen baris perintah
+import os  # Mengimpor modul os untuk driver video SDL
+import struct  # Mengimpor struct untuk offset field di dalam snapshot
+import sys  # Mengimpor modul sys untuk kode keluar
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Tidak perlu jendela
+
+import baru  # Mengimpor game
+
+# Beberapa Backspace berturut-turut harus mundur melewati beberapa snapshot, masing-masing identik dengan aslinya.
+# Pemain diam agar ronde tidak selesai; penjaga tetap berpatroli sehingga setiap snapshot berbeda.
+def check_rewind(difficulty, presses, ticks_between):
+    game = baru.Game(headless=True)
+    game.new_round(difficulty, 0)
+    rewind = baru.RewindBuffer()
+    originals = {}  # Tick -> snapshot pada permainan pertama
+    while len(rewind.snapshots) < presses + 1:
+        originals.setdefault(game.tick_count, game.snapshot())
+        rewind.record(game)
+        if game.tick(baru.decode_keys(0)) is not None:
+            return f"round ended at tick {game.tick_count} before {presses} snapshots were taken"
+
+    previous = game.tick_count
+    for press in range(presses):
+        rewind.rewind(game)
+        if game.tick_count >= previous:  # Harus lebih awal dari tujuan rewind sebelumnya
+            return f"press {press + 1} went back to tick {game.tick_count}, not before tick {previous}"
+        if game.snapshot() != originals[game.tick_count]:
+            return f"press {press + 1}: state at tick {game.tick_count} differs from the original"
+        previous = game.tick_count
+        for _ in range(ticks_between):  # Game tetap berjalan beberapa tick di antara tekanan
+            rewind.record(game)
+            game.tick(baru.decode_keys(0))
+    return None
+
+# Snapshot rusak (mis. file simpan cepat) harus ditolak dengan ValueError tanpa mengubah ronde yang sedang berjalan
+def check_corrupt_restore(difficulty):
+    game = baru.Game(headless=True)
+    game.new_round(difficulty, 0)
+    for _ in range(200):
+        game.tick(baru.decode_keys(8))
+    good = game.snapshot()
+    player_frame = baru.SNAPSHOT_HEADER.size + struct.calcsize('<ii')
+    guard_state = baru.SNAPSHOT_HEADER.size + baru.PLAYER_RECORD.size + struct.calcsize('<ddBBdIbbB')
+    cases = [(player_frame, baru.ANIMATION_FRAMES), (guard_state, 7)]
+    cases += [(offset, 0xFF) for offset in range(len(good))]  # Setiap byte diganti satu per satu
+    for offset, value in cases:
+        if offset >= len(good):
+            continue  # Kesulitan tanpa penjaga
+        blob = bytearray(good)
+        blob[offset] = value
+        try:
+            game.restore(bytes(blob))
+        except ValueError:
+            if game.snapshot() != good:
+                return f"byte {offset} = {value}: rejected, but the running round was changed"
+        except Exception as error:
+            return f"byte {offset} = {value}: {type(error).__name__}: {error}"
+        game.restore(good)
+    return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check rewind and that corrupt snapshots are rejected without touching the round.")
+    parser.add_argument('--difficulty', nargs='+', choices=baru.DIFFICULTIES, default=list(baru.DIFFICULTIES))
+    parser.add_argument('--presses', type=int, default=10, help="Backspace presses in a row")
+    parser.add_argument('--ticks-between', type=int, default=5, help="ticks played between presses")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for difficulty in args.difficulty:
+        error = check_rewind(difficulty, args.presses, args.ticks_between)
+        if error:
+            failures += 1
+            print(f"FAIL rewind {difficulty}: {error}")
+        error = check_corrupt_restore(difficulty)
+        if error:
+            failures += 1
+            print(f"FAIL restore {difficulty}: {error}")
+    if failures:
+        return 1
+    print(f"OK: {args.presses} rewinds in a row and corrupt snapshots rejected on {', '.join(args.difficulty)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
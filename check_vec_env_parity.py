@@ -0,0 +1,72 @@
+import argparse  # Mengimpor argparse untuk argumen baris perintah
+import os  # Mengimpor modul os untuk driver video SDL
+import random  # Mengimpor random untuk RNG bot
+import sys  # Mengimpor modul sys untuk kode keluar
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Tidak perlu jendela
+
+import baru  # Mengimpor game
+import vec_env  # Mengimpor env vektor yang harus mengikuti Game.tick
+from batch_sim import POLICIES  # Memakai bot yang sama dengan simulasi batch
+
+ENV_OUTCOMES = {None: vec_env.OUTCOME_NONE, baru.OUTCOME_CAUGHT: vec_env.OUTCOME_CAUGHT,
+                baru.OUTCOME_FINISHED: vec_env.OUTCOME_FINISHED}  # Hasil Game.tick -> kode hasil env
+
+# Menjalankan satu ronde Game dan MazeVecEnv(1) berdampingan; mengembalikan (hasil, None) atau (tick, selisih pertama)
+def compare_round(difficulty, seed, policy_name, max_ticks):
+    game = baru.Game(headless=True)
+    game.new_round(difficulty, seed)
+    env = vec_env.MazeVecEnv(1, difficulty, max_ticks=max_ticks + 1)  # Batas waktu env tidak pernah tercapai
+    env.reset()
+    policy = POLICIES[policy_name](random.Random(seed))
+    for tick in range(1, max_ticks + 1):
+        action = policy(game)
+        outcome = game.tick(baru.decode_keys(action))
+        _, _, _, info = env.step([action])
+        if info['outcome'][0] != ENV_OUTCOMES[outcome]:
+            return tick, f"outcome {outcome!r} vs env {int(info['outcome'][0])}"
+        if outcome is not None:
+            return outcome, None  # Env sudah direset otomatis, posisi tidak dibandingkan lagi
+        player = (game.player._x, game.player._y)
+        if tuple(int(value) for value in env.player[0]) != player:
+            return tick, f"player {player} vs env {tuple(env.player[0])}"
+        guards = [(guard._x, guard._y) for guard in game.guards]
+        env_guards = [tuple(float(value) for value in guard) for guard in env.guards[0]]
+        if env_guards != guards:
+            return tick, f"guards {guards} vs env {env_guards}"
+        if list(env.stars[0]) != game.maze._stars_collected:
+            return tick, f"stars {game.maze._stars_collected} vs env {list(env.stars[0])}"
+    return 'timeout', None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail if MazeVecEnv drifts from Game.tick on seeded rounds.")
+    parser.add_argument('--rounds', type=int, default=30, help="rounds per difficulty and guard speed")
+    parser.add_argument('--difficulty', nargs='+', choices=baru.DIFFICULTIES, default=list(baru.DIFFICULTIES))
+    parser.add_argument('--guard-speed', nargs='+', type=float, default=[baru.GUARD_SPEED, 1.7],
+                        help="guard speeds to check; a fractional speed exercises sub-pixel waypoint motion")
+    parser.add_argument('--max-ticks', type=int, default=3600)
+    args = parser.parse_args(argv)
+
+    mismatches = 0
+    for guard_speed in args.guard_speed:
+        baru.GUARD_SPEED = guard_speed  # Dibaca oleh Game() dan MazeVecEnv.step
+        for difficulty in args.difficulty:
+            outcomes = {}
+            for seed in range(args.rounds):
+                policy_name = sorted(POLICIES)[seed % len(POLICIES)]  # Bergantian greedy dan random
+                result, mismatch = compare_round(difficulty, seed, policy_name, args.max_ticks)
+                if mismatch is not None:
+                    mismatches += 1
+                    print(f"MISMATCH {difficulty} speed {guard_speed:g} seed {seed} ({policy_name}) at tick {result}: {mismatch}")
+                else:
+                    outcomes[result] = outcomes.get(result, 0) + 1
+            print(f"{difficulty:>6} speed {guard_speed:g}: {args.rounds} rounds, outcomes {outcomes}")
+
+    if mismatches:
+        print(f"FAIL: {mismatches} rounds where MazeVecEnv differs from Game.tick")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
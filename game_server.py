@@ -0,0 +1,251 @@
+import argparse  # Mengimpor argparse untuk argumen baris perintah
+import asyncio  # Mengimpor asyncio untuk banyak koneksi dalam satu proses
+import os  # Mengimpor modul os untuk driver video SDL
+import random  # Mengimpor random untuk input klien beban
+import struct  # Mengimpor struct untuk format pesan biner
+import sys  # Mengimpor modul sys untuk stderr
+import time  # Mengimpor modul time untuk mengukur waktu kerja tick
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Server tidak membuka jendela
+
+import baru  # Mengimpor game
+
+# Protokol: setiap pesan diawali panjang uint16, lalu satu byte jenis pesan
+FRAME_HEADER = struct.Struct('<H')
+MSG_HELLO = b'H'  # Klien: mulai ronde baru (indeks kesulitan B, seed I)
+MSG_INPUT = b'I'  # Klien: tombol yang sedang ditekan (bitmask B, sama dengan rekaman)
+MSG_STATE = b'S'  # Server: status lengkap setelah HELLO
+MSG_DELTA = b'D'  # Server: hanya bagian status yang berubah pada tick ini
+HELLO = struct.Struct('<BI')
+STATE_HEADER = struct.Struct('<cIHB')  # Jenis, tick, mask entitas yang berubah, flag
+POSITION = struct.Struct('<hh')  # Posisi fixed-point 1/POSITION_SCALE piksel
+POSITION_SCALE = 16
+FLAG_STARS = 1  # Bitmask bintang disertakan
+FLAG_OUTCOME = 2  # Hasil ronde disertakan (indeks di baru.OUTCOMES)
+
+TICK_RATE = 60  # Tick logika per detik untuk semua sesi
+MAX_WRITE_BUFFER = 64 * 1024  # Klien yang tidak membaca sebanyak ini diputus
+KEY_STATES = [baru.decode_keys(bits) for bits in range(16)]  # Pengganti get_pressed() untuk setiap bitmask
+
+def frame(payload):
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+def encode_state(kind, tick, old, new):
+    # Status adalah (posisi entitas, bitmask bintang, indeks hasil); old None berarti kirim semuanya
+    positions, stars, outcome = new
+    mask, flags, body = 0, 0, b''
+    for index, position in enumerate(positions):
+        if old is None or old[0][index] != position:
+            mask |= 1 << index
+            body += POSITION.pack(*position)
+    if old is None or old[1] != stars:
+        flags |= FLAG_STARS
+        body += struct.pack('<H', stars)
+    if outcome:
+        flags |= FLAG_OUTCOME
+        body += struct.pack('<B', outcome)
+    return STATE_HEADER.pack(kind, tick, mask, flags) + body
+
+def decode_state(payload, positions):
+    # Menerapkan pesan status ke daftar posisi; mengembalikan (tick, bintang atau None, hasil atau 0)
+    kind, tick, mask, flags = STATE_HEADER.unpack_from(payload)
+    offset = STATE_HEADER.size
+    index = 0
+    while mask >> index:
+        if mask >> index & 1:
+            while len(positions) <= index:
+                positions.append((0, 0))
+            positions[index] = POSITION.unpack_from(payload, offset)
+            offset += POSITION.size
+        index += 1
+    stars = outcome = None
+    if flags & FLAG_STARS:
+        stars, = struct.unpack_from('<H', payload, offset)
+        offset += 2
+    if flags & FLAG_OUTCOME:
+        outcome, = struct.unpack_from('<B', payload, offset)
+    return tick, stars, outcome or 0
+
+# Satu ronde milik satu klien
+class Session:
+    def __init__(self, writer):
+        self.writer = writer
+        self.game = baru.Game(headless=True)
+        self.keys = KEY_STATES[0]
+        self.state = None  # Status terakhir yang dikirim
+        self.active = False  # Hanya sesi dengan ronde berjalan yang di-tick
+
+    def start(self, difficulty, seed):
+        self.game.new_round(difficulty, seed)
+        self.keys = KEY_STATES[0]
+        self.state = self.snapshot(None)
+        self.active = True
+        self.writer.write(frame(encode_state(MSG_STATE, 0, None, self.state)))
+
+    def snapshot(self, outcome):
+        game = self.game
+        entities = [game.player] + game.guards
+        positions = tuple((round(entity._x * POSITION_SCALE), round(entity._y * POSITION_SCALE)) for entity in entities)
+        stars = sum(1 << index for index, collected in enumerate(game.maze._stars_collected) if collected)
+        return positions, stars, baru.OUTCOMES.index(outcome)
+
+    def step(self):
+        outcome = self.game.tick(self.keys)
+        state = self.snapshot(outcome)
+        if state != self.state:  # Tick tanpa perubahan tidak dikirim sama sekali
+            self.writer.write(frame(encode_state(MSG_DELTA, self.game.tick_count, self.state, state)))
+            self.state = state
+        if outcome is not None:
+            self.active = False  # Menunggu HELLO berikutnya (Retry)
+
+# Server asyncio: semua sesi di-tick bersama pada tick tetap
+class GameServer:
+    def __init__(self, tick_rate=TICK_RATE):
+        self.period = 1 / tick_rate
+        self.sessions = set()
+        self.ticks = 0  # Tick server sejak laporan terakhir
+        self.overruns = 0  # Tick yang selesai setelah jadwal tick berikutnya
+        self.work_times = []  # Waktu kerja setiap tick (detik) sejak laporan terakhir
+        self.dropped = 0  # Klien yang diputus karena terlalu lambat membaca
+
+    async def handle_client(self, reader, writer):
+        session = Session(writer)
+        self.sessions.add(session)
+        try:
+            while True:
+                length, = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+                payload = await reader.readexactly(length)
+                kind = payload[:1]
+                if kind == MSG_HELLO:
+                    difficulty, seed = HELLO.unpack_from(payload, 1)
+                    session.start(baru.DIFFICULTIES[difficulty], seed)
+                elif kind == MSG_INPUT:
+                    session.keys = KEY_STATES[payload[1] & 15]
+        except (asyncio.IncompleteReadError, ConnectionError, IndexError, struct.error):
+            pass  # Klien menutup koneksi atau mengirim pesan rusak
+        finally:
+            self.sessions.discard(session)
+            writer.close()
+
+    async def tick_loop(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            start = time.perf_counter()
+            for session in list(self.sessions):
+                if session.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                    self.dropped += 1
+                    self.sessions.discard(session)
+                    session.writer.close()
+                elif session.active:
+                    session.step()
+            self.work_times.append(time.perf_counter() - start)
+            self.ticks += 1
+
+            next_tick += self.period
+            delay = next_tick - loop.time()
+            if delay < 0:
+                self.overruns += 1
+                if delay < -self.period:
+                    next_tick = loop.time()  # Terlalu tertinggal: tidak mengejar tick yang terlewat
+            await asyncio.sleep(max(delay, 0))
+
+    def report(self):
+        work = sorted(self.work_times) or [0.0]
+        average = sum(work) / len(work)
+        load = average / self.period  # Bagian satu core yang dipakai untuk logika game
+        active = sum(session.active for session in self.sessions)
+        capacity = active / load if load else 0  # Perkiraan sesi per core pada TICK_RATE
+        line = (f"sessions {len(self.sessions)} (active {active})  ticks {self.ticks}  "
+                f"work avg {average * 1000:.2f} ms p99 {work[int(0.99 * (len(work) - 1))] * 1000:.2f} ms "
+                f"max {work[-1] * 1000:.2f} ms  load {load:.0%}  overruns {self.overruns}  dropped {self.dropped}  "
+                f"~{capacity:.0f} sessions/core")
+        self.ticks = self.overruns = 0
+        self.work_times = []
+        return line
+
+    async def serve(self, host, port, report_every):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"serving on {host}:{port} at {1 / self.period:.0f} ticks/s", file=sys.stderr)
+        asyncio.get_running_loop().create_task(self.tick_loop())
+        async with server:
+            while True:
+                await asyncio.sleep(report_every)
+                print(self.report(), file=sys.stderr, flush=True)
+
+# Klien beban: banyak pemain acak dalam satu proses
+class LoadStats:
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+        self.rounds = {}  # Hasil ronde -> jumlah
+
+async def run_load_client(host, port, difficulty, seed, stats, stop):
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random(seed)
+    writer.write(frame(MSG_HELLO + HELLO.pack(difficulty, seed)))
+    positions = []
+
+    async def send_inputs():
+        while not stop.is_set():
+            writer.write(frame(MSG_INPUT + bytes([rng.choice([1, 2, 4, 8, 8, 8, 0])])))
+            await asyncio.sleep(rng.uniform(0.05, 0.3))  # Pemain mengganti arah beberapa kali per detik
+
+    sender = asyncio.get_running_loop().create_task(send_inputs())
+    try:
+        while not stop.is_set():
+            length, = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+            payload = await reader.readexactly(length)
+            stats.messages += 1
+            stats.bytes += FRAME_HEADER.size + length
+            _, _, outcome = decode_state(payload, positions)
+            if outcome:
+                name = baru.OUTCOMES[outcome]
+                stats.rounds[name] = stats.rounds.get(name, 0) + 1
+                writer.write(frame(MSG_HELLO + HELLO.pack(difficulty, rng.randrange(2 ** 32))))  # Retry
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        sender.cancel()
+        writer.close()
+
+async def run_load(host, port, clients, difficulty, duration):
+    stats = LoadStats()
+    stop = asyncio.Event()
+    tasks = []
+    for index in range(clients):
+        tasks.append(asyncio.get_running_loop().create_task(run_load_client(host, port, difficulty, index, stats, stop)))
+        if index % 50 == 49:
+            await asyncio.sleep(0.05)  # Tidak membanjiri accept() sekaligus
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.sleep(0.2)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print(f"{clients} clients for {duration:.0f} s: {stats.messages / duration:,.0f} messages/s, "
+          f"{stats.bytes / duration / 1024:,.1f} KiB/s ({stats.bytes / max(stats.messages, 1):.1f} bytes/message), "
+          f"rounds {stats.rounds}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Maze Runner server for many sessions, and a load generator.")
+    parser.add_argument('mode', choices=['serve', 'load'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--tick-rate', type=int, default=TICK_RATE)
+    parser.add_argument('--report', type=float, default=5.0, help="seconds between server metric reports")
+    parser.add_argument('--clients', type=int, default=300, help="load generator connections")
+    parser.add_argument('--difficulty', choices=baru.DIFFICULTIES, default='hard')
+    parser.add_argument('--duration', type=float, default=10.0, help="load generator run time in seconds")
+    args = parser.parse_args(argv)
+
+    if args.mode == 'serve':
+        try:
+            asyncio.run(GameServer(args.tick_rate).serve(args.host, args.port, args.report))
+        except KeyboardInterrupt:
+            pass
+    else:
+        asyncio.run(run_load(args.host, args.port, args.clients, baru.DIFFICULTIES.index(args.difficulty), args.duration))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import os  # Mengimpor modul os untuk variabel lingkungan dan wait4
+import statistics  # Mengimpor statistics untuk menghitung median
+import subprocess  # Mengimpor subprocess untuk menjalankan game
+import sys  # Mengimpor modul sys untuk interpreter python
+import time  # Mengimpor modul time untuk mengukur waktu
+
+GAME_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baru.py')  # File game yang diukur
+
+# Mengukur waktu dari peluncuran proses sampai frame interaktif pertama dan RSS maksimum
+def measure_once(use_pack):
+    env = dict(os.environ, MAZE_STARTUP_PROBE='1', MAZE_SPRITE_PACK='1' if use_pack else '0')
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, GAME_PATH], stdout=subprocess.PIPE, text=True, env=env, cwd=os.path.dirname(GAME_PATH))
+    for line in process.stdout:
+        if line.startswith("first-frame"):
+            break
+    elapsed = time.perf_counter() - start
+    _, status, usage = os.wait4(process.pid, 0)  # Mengambil pemakaian sumber daya proses anak
+    if status != 0:
+        raise RuntimeError("Game exited with an error before the first frame")
+    return elapsed, usage.ru_maxrss / 1024  # ru_maxrss dalam KiB di Linux
+
+def report(use_pack, runs):
+    results = [measure_once(use_pack) for _ in range(runs)]
+    label = "sprite pack" if use_pack else "source images"
+    print(f"{label:>13}: startup {statistics.median(r[0] for r in results) * 1000:.0f} ms, "
+          f"max RSS {max(r[1] for r in results):.1f} MiB (median of {runs} runs)")
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    report(False, runs)
+    report(True, runs)
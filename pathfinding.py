@@ -0,0 +1,555 @@
+import heapq  # Mengimpor heapq untuk antrian prioritas saat memperbaiki jarak
+import importlib.util  # Mengimpor importlib.util untuk memeriksa apakah numpy tersedia
+import itertools  # Mengimpor itertools untuk nomor urut permintaan jalur
+from collections import OrderedDict, deque  # Mengimpor OrderedDict untuk cache LRU dan deque untuk BFS
+
+INF = float('inf')  # Jarak untuk tile yang tidak terjangkau
+NEIGHBOR_ORDER = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # Urutan tetangga yang sama dengan Guard.bfs
+
+def run_search(search):
+    # Menjalankan pencarian bertahap sampai selesai dan mengembalikan hasilnya
+    while True:
+        try:
+            next(search)
+        except StopIteration as done:
+            return done.value
+
+# Medan jarak dari satu tile akar (tujuan) ke semua tile, bisa diperbaiki sebagian saat layout berubah
+class DistanceField:
+    def __init__(self, layout, root, build=True):
+        self.layout = layout  # Layout labirin (dibagikan dengan Maze, bukan salinan)
+        self.rows, self.cols = len(layout), len(layout[0])
+        self.root = root  # Tile tujuan (x, y)
+        self.dist = [INF] * (self.rows * self.cols)  # Jarak ke akar untuk setiap tile
+        self.parent = [-1] * (self.rows * self.cols)  # Tile berikutnya menuju akar (pohon jalur terpendek)
+        if build:
+            self.rebuild()
+
+    def _neighbors(self, index):
+        x, y = index % self.cols, index // self.cols
+        for dx, dy in NEIGHBOR_ORDER:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.cols and 0 <= ny < self.rows and self.layout[ny][nx] == 0:
+                yield ny * self.cols + nx
+
+    def rebuild(self):
+        run_search(self.rebuild_steps())
+
+    def rebuild_steps(self):
+        # BFS penuh dari akar; yield sekali untuk setiap tile yang diperluas agar bisa dilanjutkan di frame berikutnya
+        self.dist = [INF] * (self.rows * self.cols)
+        self.parent = [-1] * (self.rows * self.cols)
+        root_x, root_y = self.root
+        if self.layout[root_y][root_x] != 0:
+            return  # Akar tertutup dinding: tidak ada tile yang terjangkau
+        root = root_y * self.cols + root_x
+        self.dist[root] = 0
+        queue = deque([root])
+        while queue:
+            current = queue.popleft()
+            for neighbor in self._neighbors(current):
+                if self.dist[neighbor] == INF:
+                    self.dist[neighbor] = self.dist[current] + 1
+                    self.parent[neighbor] = current
+                    queue.append(neighbor)
+            yield
+
+    def _propagate(self, heap):
+        # Menyebarkan penurunan jarak dari tile di heap (hanya menyentuh tile yang jaraknya membaik)
+        while heap:
+            distance, current = heapq.heappop(heap)
+            if distance > self.dist[current]:
+                continue
+            for neighbor in self._neighbors(current):
+                if distance + 1 < self.dist[neighbor]:
+                    self.dist[neighbor] = distance + 1
+                    self.parent[neighbor] = current
+                    heapq.heappush(heap, (distance + 1, neighbor))
+
+    def cell_opened(self, x, y):
+        # Dinding menjadi lantai: jarak hanya bisa turun di sekitar tile ini
+        index = y * self.cols + x
+        if (x, y) == self.root:
+            self.rebuild()
+            return
+        best = min(self._neighbors(index), key=lambda neighbor: self.dist[neighbor], default=None)
+        if best is None or self.dist[best] == INF:
+            return  # Tile baru belum terhubung ke akar
+        self.dist[index] = self.dist[best] + 1
+        self.parent[index] = best
+        self._propagate([(self.dist[index], index)])
+
+    def cell_closed(self, x, y):
+        # Lantai menjadi dinding: hanya subpohon yang melewati tile ini yang dihitung ulang
+        index = y * self.cols + x
+        if (x, y) == self.root:
+            self.rebuild()
+            return
+        if self.dist[index] == INF:
+            return  # Tile ini memang tidak terjangkau, tidak ada yang berubah
+
+        # Mengumpulkan subpohon (anak selalu bertetangga dengan induknya)
+        affected = [index]
+        queue = deque([index])
+        while queue:
+            current = queue.popleft()
+            cx, cy = current % self.cols, current // self.cols
+            for dx, dy in NEIGHBOR_ORDER:
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < self.cols and 0 <= ny < self.rows:
+                    neighbor = ny * self.cols + nx
+                    if self.parent[neighbor] == current:
+                        affected.append(neighbor)
+                        queue.append(neighbor)
+        for current in affected:
+            self.dist[current] = INF
+            self.parent[current] = -1
+
+        # Menyambungkan kembali subpohon dari tetangga yang jaraknya masih valid
+        heap = []
+        for current in affected[1:]:
+            for neighbor in self._neighbors(current):
+                if self.dist[neighbor] + 1 < self.dist[current]:
+                    self.dist[current] = self.dist[neighbor] + 1
+                    self.parent[current] = neighbor
+            if self.dist[current] != INF:
+                heap.append((self.dist[current], current))
+        heapq.heapify(heap)
+        self._propagate(heap)
+
+    def path_from(self, start):
+        # Jalur dari start ke akar; urutan tetangga sama dengan Guard.bfs sehingga langkah pertama identik
+        return run_search(self.path_steps(start))
+
+    def path_steps(self, start):
+        # Versi bertahap dari path_from: yield sekali untuk setiap tile di jalur
+        x, y = start
+        if self.dist[y * self.cols + x] == INF:
+            return [start]  # Tidak ada jalur: penjaga diam
+        path = [start]
+        while (x, y) != self.root:
+            current = self.dist[y * self.cols + x]
+            for dx, dy in NEIGHBOR_ORDER:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.cols and 0 <= ny < self.rows and self.layout[ny][nx] == 0 \
+                        and self.dist[ny * self.cols + nx] == current - 1:
+                    x, y = nx, ny
+                    break
+            path.append((x, y))
+            yield
+        return path
+
+# Pencari jalur inkremental: medan jarak per tujuan disimpan dan diperbaiki saat Maze.set_tile() dipanggil
+class IncrementalPathfinder:
+    def __init__(self, maze, max_fields=4):
+        self.maze = maze
+        self.max_fields = max_fields  # Jumlah tujuan (tile pemain terakhir) yang disimpan
+        self._fields = OrderedDict()  # Medan jarak per tile tujuan, urutan LRU
+        self._pending = []  # Perubahan tile yang belum diterapkan (x, y, nilai)
+        self.builds = 0  # Jumlah BFS penuh
+        self.repairs = 0  # Jumlah perbaikan tile
+        maze.add_layout_listener(self._on_tile_changed)
+
+    def _on_tile_changed(self, x, y, value):
+        self._pending.append((x, y, value))  # Diperbaiki saat kueri berikutnya
+
+    def _apply_pending(self):
+        for x, y, value in self._pending:
+            for field in self._fields.values():
+                if value == 0:
+                    field.cell_opened(x, y)
+                else:
+                    field.cell_closed(x, y)
+                self.repairs += 1
+        self._pending.clear()
+
+    def find_path(self, start, goal):
+        # Mengembalikan jalur [start, ..., goal] seperti Guard.bfs
+        return run_search(self.search(start, goal))
+
+    def search(self, start, goal):
+        # Versi bertahap dari find_path; layout tidak boleh berubah selama pencarian (PathRequestQueue memulai ulang)
+        if self._pending:
+            self._apply_pending()
+        field = self._fields.get(goal)
+        if field is None:
+            field = DistanceField(self.maze._layout, goal, build=False)
+            yield from field.rebuild_steps()
+            self.builds += 1
+            if goal not in self._fields:  # Pencarian lain bisa saja sudah membangun tujuan yang sama
+                self._fields[goal] = field
+                if len(self._fields) > self.max_fields:
+                    self._fields.popitem(last=False)  # Membuang tujuan yang paling lama tidak dipakai
+        else:
+            self._fields.move_to_end(goal)
+        return (yield from field.path_steps(start))
+
+# Pencarian jalur hierarkis (gaya HPA*) untuk labirin yang sangat besar
+class HierarchicalPathfinder:
+    def __init__(self, maze, cluster_size=10):
+        self.maze = maze
+        self.layout = maze._layout
+        self.rows, self.cols = len(self.layout), len(self.layout[0])
+        self.cluster_size = cluster_size  # Ukuran sisi satu cluster (tile)
+        self.clusters_x = (self.cols + cluster_size - 1) // cluster_size
+        self.clusters_y = (self.rows + cluster_size - 1) // cluster_size
+        self._borders = {}  # Pintu masuk per perbatasan cluster: [(tile_a, tile_b)]
+        self._intra = {}  # Biaya antar pintu di dalam satu cluster: {cluster: {tile: [(tile, biaya)]}}
+        self._inter = None  # Sisi antar cluster {tile: [tile]}, disusun ulang jika perbatasan berubah
+        self._goal_edges = OrderedDict()  # Sambungan tile tujuan ke pintu cluster-nya, cache LRU kecil
+        self.abstract_searches = 0  # Jumlah pencarian A* di graf abstrak
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                if cx + 1 < self.clusters_x:
+                    self._build_border((cx, cy), (cx + 1, cy))
+                if cy + 1 < self.clusters_y:
+                    self._build_border((cx, cy), (cx, cy + 1))
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                self._build_intra((cx, cy))
+        maze.add_layout_listener(self._on_tile_changed)
+
+    def _cluster_of(self, tile):
+        return (tile[0] // self.cluster_size, tile[1] // self.cluster_size)
+
+    def _bounds(self, cluster):
+        x0, y0 = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+        return x0, y0, min(x0 + self.cluster_size, self.cols), min(y0 + self.cluster_size, self.rows)
+
+    def _open(self, x, y):
+        return self.layout[y][x] == 0
+
+    def _build_border(self, cluster_a, cluster_b):
+        # Satu pintu (tengah setiap deretan tile terbuka) untuk setiap bagian perbatasan yang bisa dilewati
+        ax0, ay0, ax1, ay1 = self._bounds(cluster_a)
+        if cluster_b[0] != cluster_a[0]:  # Perbatasan vertikal (b di kanan a)
+            pairs = [((ax1 - 1, y), (ax1, y)) for y in range(ay0, ay1)]
+        else:  # Perbatasan horizontal (b di bawah a)
+            pairs = [((x, ay1 - 1), (x, ay1)) for x in range(ax0, ax1)]
+        entrances, run = [], []
+        for tile_a, tile_b in pairs + [(None, None)]:
+            if tile_a is not None and self._open(*tile_a) and self._open(*tile_b):
+                run.append((tile_a, tile_b))
+            elif run:
+                entrances.append(run[len(run) // 2])
+                run = []
+        self._borders[(cluster_a, cluster_b)] = entrances
+        self._inter = None
+
+    def _local_bfs(self, start, bounds):
+        # BFS yang tidak keluar dari batas cluster; mengembalikan jarak dan induk
+        x0, y0, x1, y1 = bounds
+        dist, parent = {start: 0}, {start: None}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for dx, dy in NEIGHBOR_ORDER:
+                neighbor = (current[0] + dx, current[1] + dy)
+                if x0 <= neighbor[0] < x1 and y0 <= neighbor[1] < y1 and neighbor not in dist and self._open(*neighbor):
+                    dist[neighbor] = dist[current] + 1
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+        return dist, parent
+
+    def _cluster_nodes(self, cluster):
+        # Tile pintu yang berada di dalam cluster ini
+        nodes = []
+        cx, cy = cluster
+        for neighbor in [(cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)]:
+            key = (cluster, neighbor) if (cluster, neighbor) in self._borders else (neighbor, cluster)
+            for tile_a, tile_b in self._borders.get(key, []):
+                nodes.append(tile_a if self._cluster_of(tile_a) == cluster else tile_b)
+        return nodes
+
+    def _build_intra(self, cluster):
+        # Biaya terpendek di dalam cluster antara semua pasangan pintu
+        nodes = self._cluster_nodes(cluster)
+        bounds = self._bounds(cluster)
+        edges = {}
+        for node in nodes:
+            dist, _ = self._local_bfs(node, bounds)
+            edges[node] = [(other, dist[other]) for other in nodes if other != node and other in dist]
+        self._intra[cluster] = edges
+
+    def _inter_edges(self):
+        if self._inter is None:
+            self._inter = {}
+            for entrances in self._borders.values():
+                for tile_a, tile_b in entrances:
+                    self._inter.setdefault(tile_a, []).append(tile_b)
+                    self._inter.setdefault(tile_b, []).append(tile_a)
+        return self._inter
+
+    def _on_tile_changed(self, x, y, value):
+        # Hanya cluster tile ini dan tetangganya yang dibangun ulang
+        cx, cy = self._cluster_of((x, y))
+        for neighbor in [(cx + 1, cy), (cx, cy + 1)]:
+            if neighbor[0] < self.clusters_x and neighbor[1] < self.clusters_y:
+                self._build_border((cx, cy), neighbor)
+        for neighbor in [(cx - 1, cy), (cx, cy - 1)]:
+            if neighbor[0] >= 0 and neighbor[1] >= 0:
+                self._build_border(neighbor, (cx, cy))
+        for cluster in [(cx, cy), (cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)]:
+            if 0 <= cluster[0] < self.clusters_x and 0 <= cluster[1] < self.clusters_y:
+                self._build_intra(cluster)
+        self._goal_edges.clear()
+
+    def _connect(self, tile):
+        # Menyambungkan tile sementara ke pintu-pintu cluster-nya
+        cluster = self._cluster_of(tile)
+        dist, _ = self._local_bfs(tile, self._bounds(cluster))
+        return {node: dist[node] for node in self._cluster_nodes(cluster) if node in dist}, dist
+
+    def _refine(self, start, end):
+        # Mengubah satu sisi abstrak menjadi jalur per tile
+        if abs(start[0] - end[0]) + abs(start[1] - end[1]) == 1:
+            return [start, end]  # Sisi antar cluster
+        _, parent = self._local_bfs(start, self._bounds(self._cluster_of(start)))
+        path = []
+        current = end
+        while current is not None:
+            path.append(current)
+            current = parent[current]
+        path.reverse()
+        return path
+
+    def find_path(self, start, goal):
+        # Mengembalikan jalur per tile hanya sampai pintu pertama; penjaga merencanakan ulang di setiap tile
+        return run_search(self.search(start, goal))
+
+    def search(self, start, goal):
+        # Versi bertahap dari find_path: yield sekali untuk setiap simpul abstrak yang diperluas
+        if start == goal or not self._open(*start) or not self._open(*goal):
+            return [start]
+        goal_edges = self._goal_edges.get(goal)
+        if goal_edges is None:
+            goal_edges, _ = self._connect(goal)
+            self._goal_edges[goal] = goal_edges
+            if len(self._goal_edges) > 8:
+                self._goal_edges.popitem(last=False)
+        start_edges, start_dist = self._connect(start)
+        if goal in start_dist:  # Tujuan di cluster yang sama dan bisa dicapai langsung
+            start_edges[goal] = start_dist[goal]
+
+        # A* di graf abstrak (pintu cluster), jumlah simpul sebanding dengan jumlah cluster
+        self.abstract_searches += 1
+        inter = self._inter_edges()
+        goal_x, goal_y = goal
+        best = {start: 0}
+        came_from = {start: None}
+        heap = [(abs(start[0] - goal_x) + abs(start[1] - goal_y), 0, start)]
+        while heap:
+            _, cost, node = heapq.heappop(heap)
+            if node == goal:
+                break
+            if cost > best[node]:
+                continue
+            yield
+            if node == start:
+                edges = list(start_edges.items()) + [(other, 1) for other in inter.get(node, [])]
+            else:
+                edges = list(self._intra[self._cluster_of(node)].get(node, []))
+                edges += [(other, 1) for other in inter.get(node, [])]
+                if node in goal_edges:
+                    edges.append((goal, goal_edges[node]))
+            for other, step in edges:
+                new_cost = cost + step
+                if new_cost < best.get(other, INF):
+                    best[other] = new_cost
+                    came_from[other] = node
+                    heapq.heappush(heap, (new_cost + abs(other[0] - goal_x) + abs(other[1] - goal_y), new_cost, other))
+        if goal not in came_from:
+            return [start]  # Tidak ada jalur
+
+        # Mencari simpul abstrak pertama setelah start, lalu memperhalusnya saja
+        node = goal
+        while came_from[node] != start:
+            node = came_from[node]
+        return self._refine(start, node)
+
+PATH_BUDGET_MS = 2.0  # Anggaran waktu pencarian jalur per tick
+PATH_NODES_PER_MS = 500  # Perkiraan simpul yang diperluas per milidetik (konservatif)
+
+# Antrian permintaan jalur dengan anggaran per tick; pencarian yang belum selesai dilanjutkan di tick berikutnya
+class PathRequestQueue:
+    def __init__(self, pathfinder, budget_ms=PATH_BUDGET_MS, nodes_per_ms=PATH_NODES_PER_MS):
+        self.pathfinder = pathfinder
+        # Anggaran dihitung dalam simpul, bukan jam dinding, agar hasil tetap deterministik untuk replay
+        self.budget_nodes = max(1, int(budget_ms * nodes_per_ms))
+        self.remaining = self.budget_nodes  # Sisa anggaran pada tick ini
+        self._heap = []  # (prioritas, nomor urut, pemilik); prioritas kecil diproses lebih dulu
+        self._jobs = {}  # Pemilik -> [pencarian, start, tujuan, versi layout]
+        self._results = {}  # Pemilik -> jalur yang sudah selesai
+        self._sequence = itertools.count()
+        self.completed = 0  # Jumlah pencarian yang selesai
+        self.resumed = 0  # Jumlah pencarian yang dilanjutkan dari tick sebelumnya
+        self.expansions = 0  # Total simpul yang diperluas
+
+    def clear(self):
+        self._heap.clear()
+        self._jobs.clear()
+        self._results.clear()
+
+    def begin_tick(self):
+        # Mengisi ulang anggaran dan melanjutkan pencarian yang tertunda
+        self.remaining = self.budget_nodes
+        self.resumed += len(self._jobs)
+        self.process()
+
+    def request(self, owner, start, goal, priority=0):
+        # Satu pencarian per pemilik; permintaan baru diabaikan selama yang lama belum selesai
+        if owner in self._jobs:
+            return
+        self._results.pop(owner, None)
+        version = self.pathfinder.maze.layout_version
+        self._jobs[owner] = [self.pathfinder.search(start, goal), start, goal, version]
+        heapq.heappush(self._heap, (priority, next(self._sequence), owner))
+        self.process()  # Langsung dikerjakan jika anggaran tick ini masih ada
+
+    def take(self, owner):
+        # Mengambil jalur yang sudah selesai untuk pemilik ini, atau None
+        return self._results.pop(owner, None)
+
+    def pending(self, owner):
+        return owner in self._jobs
+
+    def process(self):
+        maze = self.pathfinder.maze
+        while self._heap and self.remaining > 0:
+            owner = self._heap[0][2]
+            job = self._jobs[owner]
+            if job[3] != maze.layout_version:  # Layout berubah di tengah pencarian: mulai ulang
+                job[0] = self.pathfinder.search(job[1], job[2])
+                job[3] = maze.layout_version
+            try:
+                while self.remaining > 0:
+                    next(job[0])
+                    self.remaining -= 1
+                    self.expansions += 1
+            except StopIteration as done:
+                heapq.heappop(self._heap)
+                del self._jobs[owner]
+                self._results[owner] = done.value
+                self.completed += 1
+
+def build_next_hop_table(layout):
+    # Langkah pertama jalur terpendek untuk semua pasangan tile lantai, sama dengan path[1] dari Guard.bfs.
+    # BFS dari semua tile sekaligus dengan numpy, satu level per iterasi, hanya untuk pasangan (sumber, tile)
+    # di frontier. Urutan antrian FIFO ditiru dengan peringkat: tetangga yang lebih dulu keluar antrian menjadi induk.
+    import numpy as np  # Hanya dimuat jika tabel dipakai
+
+    rows, cols = len(layout), len(layout[0])
+    tile_index = np.full((rows, cols), -1, dtype=np.int32)  # Indeks node untuk setiap tile lantai
+    ys, xs = np.nonzero(np.array(layout) == 0)  # Urutan baris demi baris
+    count = len(xs)
+    tile_index[ys, xs] = np.arange(count)
+    node_xy = np.stack([xs, ys], axis=1).astype(np.int32).reshape(-1, 2)
+
+    directions = len(NEIGHBOR_ORDER)
+    neighbors = np.full((count, directions), -1, dtype=np.int64)  # Tetangga per arah NEIGHBOR_ORDER (-1 = tidak ada)
+    for direction, (dx, dy) in enumerate(NEIGHBOR_ORDER):
+        nx, ny = xs + dx, ys + dy
+        inside = (nx >= 0) & (nx < cols) & (ny >= 0) & (ny < rows)
+        neighbors[inside, direction] = tile_index[ny[inside], nx[inside]]
+
+    sources = np.arange(count, dtype=np.int64)
+    first = np.repeat(sources, count)  # first[sumber * count + tile]; tanpa jalur: tetap di tempat
+    visited = np.zeros(count * count, dtype=bool)
+    visited[sources * count + sources] = True
+    frontier_source, frontier_tile, frontier_rank = sources, sources, np.zeros(count, dtype=np.int64)
+    while len(frontier_source):
+        # Semua langkah dari frontier; kunci = urutan keluar antrian induk, lalu urutan arah
+        source = np.repeat(frontier_source, directions)
+        parent = np.repeat(frontier_tile, directions)
+        tile = neighbors[frontier_tile].reshape(-1)
+        key = np.repeat(frontier_rank, directions) * directions + np.tile(np.arange(directions), len(frontier_tile))
+        valid = tile >= 0
+        source, parent, tile, key = source[valid], parent[valid], tile[valid], key[valid]
+        pair = source * count + tile
+        fresh = ~visited[pair]
+        source, parent, tile, key, pair = source[fresh], parent[fresh], tile[fresh], key[fresh], pair[fresh]
+
+        order = np.lexsort((key, pair))  # Per pasangan, induk dengan kunci terkecil menang
+        source, parent, tile, key, pair = source[order], parent[order], tile[order], key[order], pair[order]
+        winner = np.ones(len(pair), dtype=bool)
+        winner[1:] = pair[1:] != pair[:-1]
+        source, parent, tile, key, pair = source[winner], parent[winner], tile[winner], key[winner], pair[winner]
+
+        visited[pair] = True
+        first[pair] = np.where(parent == source, tile, first[source * count + parent])
+        order = np.lexsort((key, source))  # Urutan antrian level berikutnya; hanya dibandingkan dalam sumber yang sama
+        frontier_source, frontier_tile = source[order], tile[order]
+        frontier_rank = np.arange(len(order), dtype=np.int64)
+
+    dtype = np.uint8 if count <= 256 else np.uint16
+    return tile_index, node_xy, first.reshape(count, count).astype(dtype)
+
+NEXT_HOP_CACHE_SIZE = 4  # Jumlah layout terakhir yang tabelnya disimpan (dipakai bersama oleh semua Maze)
+_next_hop_tables = OrderedDict()  # Layout (tuple) -> hasil build_next_hop_table, urutan LRU
+
+# Tabel langkah berikutnya untuk semua pasangan tile: satu lookup per langkah, tanpa pencarian saat bermain
+class NextHopPathfinder:
+    def __init__(self, maze):
+        self.maze = maze
+        self.next_hop = None  # Matriks uint8/uint16 [node awal, node tujuan] -> node berikutnya, dibuat oleh build()
+        self.builds = 0  # Jumlah tabel yang disiapkan untuk labirin ini (dari cache atau dibangun)
+        maze.add_layout_listener(self._on_tile_changed)
+
+    def _on_tile_changed(self, x, y, value):
+        self.next_hop = None  # Dibangun ulang saat dibutuhkan
+
+    def build(self):
+        # Dipanggil saat level dimuat agar tidak ada jeda di tengah ronde
+        if self.next_hop is None:
+            key = tuple(map(tuple, self.maze._layout))
+            table = _next_hop_tables.get(key)
+            if table is None:  # Game lain dengan layout yang sama tidak membangun ulang
+                table = build_next_hop_table(self.maze._layout)
+                _next_hop_tables[key] = table
+                if len(_next_hop_tables) > NEXT_HOP_CACHE_SIZE:
+                    _next_hop_tables.popitem(last=False)
+            _next_hop_tables.move_to_end(key)
+            tile_index, node_xy, self.next_hop = table
+            self._index = tile_index.tolist()  # Lookup list Python lebih cepat daripada skalar numpy
+            self._nodes = [tuple(xy) for xy in node_xy.tolist()]
+            self.builds += 1
+
+    def next_tile(self, start, goal):
+        # Tile berikutnya dari start menuju goal; start sendiri jika sudah tiba atau tidak ada jalur
+        self.build()
+        start_index = self._index[start[1]][start[0]]
+        goal_index = self._index[goal[1]][goal[0]]
+        if start_index < 0 or goal_index < 0:
+            return start
+        return self._nodes[self.next_hop[start_index, goal_index]]
+
+    def find_path(self, start, goal):
+        return run_search(self.search(start, goal))
+
+    def search(self, start, goal):
+        # Antarmuka yang sama dengan pencari lain; jalur disusun dari tabel tanpa ekspansi simpul
+        yield from ()
+        path = [start]
+        while path[-1] != goal:
+            step = self.next_tile(path[-1], goal)
+            if step == path[-1]:
+                break  # Tidak ada jalur
+            path.append(step)
+        return path
+
+HIERARCHICAL_MIN_TILES = 10000  # Mulai ukuran ini (misalnya 100x100) penjaga memakai pencarian hierarkis
+NEXT_HOP_MAX_BYTES = 256 * 1024  # Tabel semua pasangan dipakai selama muat dalam batas ini (sekitar 360 tile lantai)
+
+def next_hop_table_bytes(walkable):
+    # Ukuran tabel untuk sejumlah tile lantai: indeks uint8 sampai 256 node, uint16 di atasnya
+    return walkable * walkable * (1 if walkable <= 256 else 2)
+
+def choose_pathfinder(maze):
+    # Memilih pencari jalur sesuai ukuran labirin
+    layout = maze._layout
+    if len(layout) * len(layout[0]) >= HIERARCHICAL_MIN_TILES:
+        return HierarchicalPathfinder(maze)
+    walkable = sum(row.count(0) for row in layout)
+    if next_hop_table_bytes(walkable) <= NEXT_HOP_MAX_BYTES and importlib.util.find_spec('numpy') is not None:
+        return NextHopPathfinder(maze)  # Labirin kecil dan sedang
+    return IncrementalPathfinder(maze)
@@ -0,0 +1,48 @@
+import argparse  # Mengimpor argparse untuk argumen baris perintah
+import sys  # Mengimpor modul sys untuk kode keluar
+import time  # Mengimpor modul time untuk mengukur kecepatan replay
+
+import baru  # Mengimpor game
+
+# Memutar ulang rekaman input dan memeriksa hash status di setiap tick
+def replay(game, log, render=False, speed=0):
+    game.new_round(log.difficulty, log.seed)
+
+    outcome = None
+    for tick, bits in enumerate(log.inputs):
+        outcome = game.tick(baru.decode_keys(bits))
+        if game.state_hash() != log.hashes[tick]:
+            return tick, outcome  # Status berbeda dari rekaman
+        if render:
+            game.draw()
+            baru.pygame.event.pump()  # Menjaga jendela tetap responsif
+            baru.present()
+            if speed:
+                baru.clock.tick(60 * speed)  # Kecepatan relatif terhadap 60 tick per detik
+    return None, outcome
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded Maze Runner round and verify its state hashes.")
+    parser.add_argument('log', help="replay file written with MAZE_RECORD_DIR")
+    parser.add_argument('--render', action='store_true', help="draw the replay in a window")
+    parser.add_argument('--speed', type=float, default=0, help="playback speed multiple of 60 ticks/s when rendering (0 = uncapped)")
+    args = parser.parse_args(argv)
+
+    log = baru.InputLog.load(args.log)
+    game = baru.Game(headless=not args.render)
+    start = time.perf_counter()
+    mismatch, outcome = replay(game, log, args.render, args.speed)
+    elapsed = time.perf_counter() - start
+
+    if mismatch is not None:
+        print(f"DESYNC at tick {mismatch} of {len(log.inputs)}")
+        return 1
+    if outcome != log.outcome:
+        print(f"DESYNC: replay ended with {outcome!r}, recording ended with {log.outcome!r}")
+        return 1
+    print(f"OK: {len(log.inputs)} ticks ({log.difficulty}, seed {log.seed}, outcome {outcome}) "
+          f"in {elapsed:.3f} s ({len(log.inputs) / max(elapsed, 1e-9):.0f} ticks/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
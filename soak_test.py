@@ -0,0 +1,66 @@
+import argparse  # Mengimpor argparse untuk argumen baris perintah
+import os  # Mengimpor modul os untuk driver video SDL
+import random  # Mengimpor random untuk RNG bot
+import sys  # Mengimpor modul sys untuk kode keluar
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Tidak perlu jendela
+
+import baru  # Mengimpor game
+from batch_sim import POLICIES  # Memakai bot yang sama dengan simulasi batch
+
+SCENES = {baru.OUTCOME_CAUGHT: 'lose_menu', baru.OUTCOME_FINISHED: 'finish_menu', None: 'timeout_menu'}  # Layar setelah ronde
+
+# Menjalankan banyak sesi Retry / Back to Main Menu tanpa layar dan gagal jika memori terus bertambah
+def play_session(game, difficulty, seed, policy_name, max_ticks, retry=False):
+    if retry:
+        game.restore(game.round_start)  # Sama seperti tombol "Retry": snapshot awal ronde dipulihkan di tempat
+    else:
+        game.new_round(difficulty, seed)
+    policy = POLICIES[policy_name](random.Random(seed))
+    outcome = None
+    while outcome is None and game.tick_count < max_ticks:
+        outcome = game.tick(baru.decode_keys(policy(game)))
+    return outcome
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak-test repeated Maze Runner sessions and fail on memory growth.")
+    parser.add_argument('--sessions', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30, help="sessions before the growth baseline is taken")
+    parser.add_argument('--back-every', type=int, default=5, help="rebuild the game like 'Back to Main Menu' every N sessions")
+    parser.add_argument('--retry-every', type=int, default=2, help="replay the previous round like 'Retry' every N sessions (0 = never)")
+    parser.add_argument('--difficulty', choices=baru.DIFFICULTIES, default='hard')
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--max-ticks', type=int, default=3600)
+    parser.add_argument('--max-growth-kb', type=float, default=64.0, help="allowed traced growth after warm-up")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--verbose', action='store_true', help="print a report at every scene transition")
+    args = parser.parse_args(argv)
+
+    game = baru.Game(headless=True)  # Dibuat sebelum pelacakan agar impor pygame dan sprite tidak ikut terhitung
+    tracker = baru.MemoryTracker(top=args.top, verbose=args.verbose)
+    tracker.snapshot('start')
+    outcomes = {}
+    retries = 0
+    for session in range(args.sessions):
+        if session % args.back_every == 0:
+            game.__init__(headless=True)  # Sama seperti tombol "Back to Main Menu"
+        retry = bool(args.retry_every) and session % args.retry_every == args.retry_every - 1 and game.round_start is not None
+        retries += retry
+        outcome = play_session(game, args.difficulty, session, args.policy, args.max_ticks, retry)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        tracker.snapshot(('retry ' if retry else '') + SCENES[outcome])
+        if session + 1 == args.warmup:
+            tracker.mark_baseline()
+
+    growth_kb = tracker.growth() / 1024
+    print(tracker.baseline_report(f"after {args.sessions} sessions, since session {args.warmup}"))
+    print(f"outcomes {outcomes}, {retries} retries; growth {growth_kb:+.1f} KiB (limit {args.max_growth_kb:.1f} KiB)")
+    tracker.stop()
+    if growth_kb > args.max_growth_kb:
+        print("FAIL: memory keeps growing across sessions")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+import argparse  # Mengimpor argparse untuk argumen baris perintah
+import math  # Mengimpor math untuk ukuran sub-langkah pemain
+import multiprocessing  # Mengimpor multiprocessing untuk membagi env ke beberapa proses
+import time  # Mengimpor modul time untuk mengukur throughput
+
+import numpy as np  # Mengimpor numpy untuk status env berbasis array
+
+import baru  # Mengimpor layout, konstanta dan aturan game
+from pathfinding import build_next_hop_table  # Tabel langkah berikutnya yang sama dengan NextHopPathfinder
+
+# Hasil langkah env (sama dengan urutan baru.OUTCOMES, ditambah batas waktu)
+OUTCOME_NONE = 0  # Ronde masih berjalan
+OUTCOME_CAUGHT = 1  # Pemain tertangkap penjaga
+OUTCOME_FINISHED = 2  # Pemain mencapai garis finish
+OUTCOME_TIMEOUT = 3  # Ronde dihentikan karena melewati max_ticks
+
+# Reward untuk agen
+STAR_REWARD = 1.0  # Untuk setiap bintang yang dikumpulkan
+FINISH_REWARD = 10.0  # Untuk mencapai garis finish
+CAUGHT_REWARD = -10.0  # Untuk tertangkap penjaga
+
+# N game independen yang berjalan serempak dengan status berbasis array
+class MazeVecEnv:
+    def __init__(self, num_envs, difficulty='easy', max_ticks=3600):
+        maze = baru.Maze()  # Hanya layout dan posisi bintang, tanpa gambar
+        self.num_envs = num_envs
+        self.difficulty = difficulty
+        self.max_ticks = max_ticks  # Batas panjang satu ronde
+        self.layout = np.array(maze._layout, dtype=np.uint8)
+        self.walkable = self.layout == 0
+        self.tile_index, self.node_xy, self.next_hop = build_next_hop_table(maze._layout)
+        self.visible = np.zeros((len(self.node_xy), len(self.node_xy)), dtype=bool)  # Garis pandang antar node (Maze.visible_from)
+        for index, (x, y) in enumerate(self.node_xy):
+            for seen_x, seen_y in maze.visible_from((int(x), int(y))):
+                self.visible[index, self.tile_index[seen_y, seen_x]] = True
+
+        tile = baru.TILE_SIZE
+        self.star_positions = np.array(maze._star_positions, dtype=np.int32)  # (S, 2)
+        self.player_start = np.array(baru.PLAYER_START, dtype=np.int32) * tile
+        self.guard_start = np.array(baru.GUARD_SETUPS[difficulty], dtype=np.int32).reshape(-1, 2) * tile  # (G, 2)
+        # Rute patroli per penjaga sebagai indeks node, diisi ulang sampai panjang rute terpanjang (Maze.patrol_route)
+        routes = [[self.tile_index[y, x] for x, y in maze.patrol_route(tuple(home))] for home in baru.GUARD_SETUPS[difficulty]]
+        self.route_length = np.array([len(route) for route in routes], dtype=np.int32).reshape(-1)  # (G,)
+        longest = max(self.route_length, default=1)
+        self.routes = np.array([route + route[:1] * (longest - len(route)) for route in routes], dtype=np.int32).reshape(-1, longest)
+
+        # Status semua env
+        self.player = np.zeros((num_envs, 2), dtype=np.int32)
+        self.guards = np.zeros((num_envs, len(self.guard_start), 2), dtype=np.float64)  # Posisi sub-piksel
+        self.guard_targets = np.zeros_like(self.guards)  # Waypoint yang sedang dituju setiap penjaga
+        self.guard_last_update = np.zeros(self.guards.shape[:2], dtype=np.int32)  # Tick update terakhir (AIScheduler)
+        self.guard_state = np.zeros(self.guards.shape[:2], dtype=np.int8)  # baru.GUARD_PATROL / CHASE / SEARCH
+        self.patrol_index = np.zeros(self.guards.shape[:2], dtype=np.int32)  # Posisi di rute patroli yang dituju
+        self.last_seen = np.zeros(self.guards.shape[:2], dtype=np.int32)  # Node pemain saat terakhir terlihat
+        self.tier_limits = np.array([np.inf if limit is None else limit for limit, _ in baru.AI_TIERS])
+        self.tier_intervals = np.array([interval for _, interval in baru.AI_TIERS], dtype=np.int32)
+        self.stars = np.zeros((num_envs, len(self.star_positions)), dtype=bool)
+        self.ticks = np.zeros(num_envs, dtype=np.int32)
+
+    @property
+    def observation_size(self):
+        return 2 + self.guards.shape[1] * 2 + self.stars.shape[1]
+
+    def reset(self):
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self._observe()
+
+    def _reset_envs(self, mask):
+        self.player[mask] = self.player_start
+        self.guards[mask] = self.guard_start
+        self.guard_targets[mask] = self.guard_start  # Di batas tile: rencanakan pada tick pertama
+        self.guard_last_update[mask] = 0
+        self.guard_state[mask] = baru.GUARD_PATROL
+        self.patrol_index[mask] = 0
+        self.stars[mask] = False
+        self.ticks[mask] = 0
+
+    def _observe(self):
+        # Observasi: posisi pemain, posisi penjaga, status bintang
+        return np.concatenate([
+            self.player,
+            self.guards.reshape(self.num_envs, -1),
+            self.stars,
+        ], axis=1).astype(np.float32)
+
+    def _plan(self, planning, guard_tiles, player_tiles):
+        # Status patroli/kejar/cari dan tile berikutnya untuk penjaga di batas tile (sama dengan Guard.next_waypoint)
+        state, last_seen, patrol_index = self.guard_state, self.last_seen, self.patrol_index
+        seen = planning & self.visible[guard_tiles, player_tiles[:, None]]
+        state[seen] = baru.GUARD_CHASE
+        last_seen[seen] = np.broadcast_to(player_tiles[:, None], seen.shape)[seen]
+        lost = planning & ~seen & (state != baru.GUARD_PATROL)
+        state[lost] = baru.GUARD_SEARCH
+        state[lost & (guard_tiles == last_seen)] = baru.GUARD_PATROL
+
+        guard_index = np.arange(guard_tiles.shape[1])
+        patrolling = planning & (state == baru.GUARD_PATROL)
+        on_route = patrolling & (guard_tiles == self.routes[guard_index, patrol_index])
+        patrol_index[on_route] = ((patrol_index + 1) % self.route_length)[on_route]
+        goals = np.where(patrolling, self.routes[guard_index, patrol_index], last_seen)
+        return np.where(on_route, goals, self.next_hop[guard_tiles, goals])
+
+    def step(self, actions):
+        # actions: bitmask input per env dengan urutan bit baru.INPUT_KEYS (atas, bawah, kiri, kanan)
+        actions = np.asarray(actions, dtype=np.int32)
+        tile = baru.TILE_SIZE
+        rows, cols = self.layout.shape
+        px, py = self.player[:, 0], self.player[:, 1]
+        gx, gy = self.guards[:, :, 0], self.guards[:, :, 1]
+
+        # Penjaga mengikuti waypoint dan merencanakan ulang hanya di batas tile (sama dengan Guard.move)
+        tx, ty = self.guard_targets[:, :, 0], self.guard_targets[:, :, 1]
+        player_tiles = self.tile_index[py // tile, px // tile]
+
+        # Jadwal update penjaga berdasarkan jarak (sama dengan baru.AIScheduler)
+        tick = self.ticks[:, None] + 1
+        distance = (np.abs(gx - px[:, None]) + np.abs(gy - py[:, None])) / tile
+        tier = np.minimum((distance[..., None] > self.tier_limits).sum(axis=-1), len(self.tier_limits) - 1)
+        due = (tick + np.arange(gx.shape[1])) % self.tier_intervals[tier] == 0
+        elapsed = np.where(due, tick - self.guard_last_update, 0)
+        self.guard_last_update[:] = np.where(due, tick, self.guard_last_update)
+        budget = baru.GUARD_SPEED * elapsed.astype(np.float64)
+        while True:
+            active = budget > 0
+            planning = active & (gx == tx) & (gy == ty)
+            if planning.any():
+                guard_tiles = self.tile_index[gy.astype(np.int32) // tile, gx.astype(np.int32) // tile]
+                next_tiles = self._plan(planning, guard_tiles, player_tiles)
+                tx[planning] = self.node_xy[next_tiles, 0][planning] * tile
+                ty[planning] = self.node_xy[next_tiles, 1][planning] * tile
+                budget[planning & (next_tiles == guard_tiles)] = 0  # Sudah di tile pemain
+                active = budget > 0
+            if not active.any():
+                break
+            dx, dy = tx - gx, ty - gy
+            distance = np.abs(dx) + np.abs(dy)
+            arrived = active & (budget >= distance)
+            partial = active & ~arrived
+            gx[:] = np.where(arrived, tx, np.where(partial, gx + np.sign(dx) * budget, gx))
+            gy[:] = np.where(arrived, ty, np.where(partial, gy + np.sign(dy) * budget, gy))
+            budget = np.where(arrived, budget - distance, 0)
+        caught_by_guard = (due & (np.abs(gx - px[:, None]) < tile) & (np.abs(gy - py[:, None]) < tile)).any(axis=1)
+
+        # Pemain bergerak sesuai input, dibatasi layar, sampai menyentuh dinding (sama dengan Maze.sweep_box).
+        # Batas tile hanya bisa dilewati di kelipatan gcd(kecepatan, tile), jadi sub-langkah sebesar itu sudah eksak
+        # selama gerakannya lurus atau diagonal penuh (selalu benar jika PLAYER_SPEED membagi TILE_SIZE).
+        new_x = px + ((actions >> 3 & 1) - (actions >> 2 & 1)) * baru.PLAYER_SPEED
+        new_y = py + ((actions >> 1 & 1) - (actions & 1)) * baru.PLAYER_SPEED
+        new_x = np.clip(new_x, 0, baru.WIDTH - tile)
+        substep = math.gcd(baru.PLAYER_SPEED, tile)
+        target_x, target_y = new_x.copy(), new_y.copy()  # new_x tetap tujuan awal untuk pemeriksaan finish
+        step_x, step_y = np.sign(new_x - px) * substep, np.sign(new_y - py) * substep
+        on_star = (self.star_positions[None, :, 0] == px[:, None]) & (self.star_positions[None, :, 1] == py[:, None])
+        for _ in range(baru.PLAYER_SPEED // substep):
+            move_x = np.where(px != target_x, step_x, 0)
+            move_y = np.where(py != target_y, step_y, 0)
+            # Tile yang ditutupi sesaat setelah meninggalkan posisi ini
+            left = np.where(move_x < 0, -(-px // tile) - 1, px // tile)
+            right = np.where(move_x > 0, px // tile + 1, -(-px // tile))
+            top = np.where(move_y < 0, -(-py // tile) - 1, py // tile)
+            bottom = np.where(move_y > 0, py // tile + 1, -(-py // tile))
+            inside = (left >= 0) & (right < cols) & (top >= 0) & (bottom < rows)
+            left_c, right_c = np.clip(left, 0, cols - 1), np.clip(right, 0, cols - 1)
+            top_c, bottom_c = np.clip(top, 0, rows - 1), np.clip(bottom, 0, rows - 1)
+            free = inside & (self.walkable[top_c, left_c] & self.walkable[top_c, right_c] &
+                             self.walkable[bottom_c, left_c] & self.walkable[bottom_c, right_c])
+            target_x = np.where(free, target_x, px)  # Menabrak dinding: berhenti di sini
+            target_y = np.where(free, target_y, py)
+            px += np.where(free, move_x, 0)
+            py += np.where(free, move_y, 0)
+            on_star |= (self.star_positions[None, :, 0] == px[:, None]) & (self.star_positions[None, :, 1] == py[:, None])
+
+        # Mengumpulkan bintang dan memeriksa garis finish
+        new_stars = on_star & ~self.stars
+        self.stars |= on_star
+        finished = (new_x + tile >= baru.WIDTH) & self.stars.all(axis=1)
+        caught_after = ((gx == px[:, None]) & (gy == py[:, None])).any(axis=1)
+
+        self.ticks += 1
+        outcome = np.full(self.num_envs, OUTCOME_NONE, dtype=np.int8)
+        outcome[self.ticks >= self.max_ticks] = OUTCOME_TIMEOUT
+        outcome[caught_after] = OUTCOME_CAUGHT
+        outcome[finished] = OUTCOME_FINISHED
+        outcome[caught_by_guard] = OUTCOME_CAUGHT  # Penjaga bergerak lebih dulu, jadi tertangkap menang
+
+        reward = (new_stars.sum(axis=1) * STAR_REWARD +
+                  (outcome == OUTCOME_FINISHED) * FINISH_REWARD +
+                  (outcome == OUTCOME_CAUGHT) * CAUGHT_REWARD).astype(np.float32)
+        done = outcome != OUTCOME_NONE
+        info = {'outcome': outcome, 'ticks': self.ticks.copy()}
+        if done.any():
+            self._reset_envs(done)  # Env yang selesai langsung dimulai ulang
+        return self._observe(), reward, done, info
+
+def _shard_worker(connection, num_envs, difficulty, max_ticks):
+    # Proses pekerja yang menjalankan satu MazeVecEnv
+    env = MazeVecEnv(num_envs, difficulty, max_ticks)
+    while True:
+        command, data = connection.recv()
+        if command == 'step':
+            connection.send(env.step(data))
+        elif command == 'reset':
+            connection.send(env.reset())
+        elif command == 'close':
+            connection.close()
+            return
+
+# Membagi env ke beberapa proses; setiap proses menjalankan satu MazeVecEnv
+class ShardedVecEnv:
+    def __init__(self, num_shards, envs_per_shard, difficulty='easy', max_ticks=3600):
+        self.num_envs = num_shards * envs_per_shard
+        self.envs_per_shard = envs_per_shard
+        self._connections = []
+        self._processes = []
+        for _ in range(num_shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child, envs_per_shard, difficulty, max_ticks), daemon=True)
+            process.start()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    def reset(self):
+        for connection in self._connections:
+            connection.send(('reset', None))
+        return np.concatenate([connection.recv() for connection in self._connections])
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int32)
+        for index, connection in enumerate(self._connections):  # Semua shard melangkah bersamaan
+            connection.send(('step', actions[index * self.envs_per_shard:(index + 1) * self.envs_per_shard]))
+        results = [connection.recv() for connection in self._connections]
+        observations, rewards, dones, infos = zip(*results)
+        info = {key: np.concatenate([shard_info[key] for shard_info in infos]) for key in infos[0]}
+        return np.concatenate(observations), np.concatenate(rewards), np.concatenate(dones), info
+
+    def close(self):
+        for connection in self._connections:
+            connection.send(('close', None))
+        for process in self._processes:
+            process.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized Maze Runner environment with random actions.")
+    parser.add_argument('--envs', type=int, default=1024, help="environments per shard")
+    parser.add_argument('--shards', type=int, default=1, help="worker processes (1 = run in this process)")
+    parser.add_argument('--steps', type=int, default=500)
+    parser.add_argument('--difficulty', choices=baru.DIFFICULTIES, default='hard')
+    args = parser.parse_args()
+
+    env = MazeVecEnv(args.envs, args.difficulty) if args.shards == 1 else ShardedVecEnv(args.shards, args.envs, args.difficulty)
+    env.reset()
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        env.step(rng.integers(0, 16, env.num_envs))
+    elapsed = time.perf_counter() - start
+    print(f"{env.num_envs * args.steps / elapsed:,.0f} env-steps/s ({env.num_envs} envs x {args.steps} steps in {elapsed:.2f} s)")
+    if args.shards > 1:
+        env.close()